@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+DefenseShot: Elite Sniper Academy
+PDF reader benchmark - page load and flip animation cost, old path vs new
+
+Run with: python benchmarks/bench_pdf_reader.py [path/to/module_N.pdf]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pygame
+
+from config import PDF_FLIP_STEPS, STUDY_DIR
+from reader.surfaces import FlipAnimation, PixmapSurface
+
+FLIP_FRAMES = 30
+WIDTH, HEIGHT = 1920, 1080
+
+
+def render_page(doc, number):
+    page = doc.load_page(number)
+    rect = page.rect
+    scale = min((WIDTH * 0.8) / rect.width, (HEIGHT * 0.8) / rect.height)
+    return page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+
+
+def flip_copy_and_rescale(pix):
+    """Previous reader: bytes copy, then a full-page rescale every frame"""
+    allocated = len(pix.samples)
+    surface = pygame.image.frombuffer(pix.samples, (pix.width, pix.height), "RGB")
+    for remaining in range(FLIP_FRAMES - 1, 0, -1):
+        scale = 1.0 + (remaining / 30.0) * 0.2
+        size = (int(surface.get_width() * scale), int(surface.get_height() * scale))
+        scaled = pygame.transform.scale(surface, size)
+        allocated += scaled.get_bytesize() * size[0] * size[1]
+    return allocated
+
+
+def flip_zero_copy_cached(pix, flip):
+    """Current reader: shared pixmap buffer, quantized frames in reused buffers"""
+    before = flip.allocated_bytes
+    image = PixmapSurface(pix)
+    flip.start(image.surface)
+    for remaining in range(FLIP_FRAMES - 1, 0, -1):
+        flip.frame_at(remaining)
+    return flip.allocated_bytes - before
+
+
+def measure(label, pixmaps, run):
+    # Warm up once so buffers reused across flips are not counted as per-flip cost
+    run(pixmaps[0])
+    allocated = 0
+    start = time.perf_counter()
+    for pix in pixmaps:
+        allocated += run(pix)
+    elapsed = time.perf_counter() - start
+    flips = len(pixmaps)
+    per_flip_ms = elapsed / flips * 1000
+    print(f"{label:<28} {per_flip_ms:8.2f} ms/flip {per_flip_ms / FLIP_FRAMES:8.3f} ms/frame "
+          f"{allocated / flips / 1024:10.1f} KiB/flip")
+    return per_flip_ms, allocated / flips
+
+
+def main():
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(STUDY_DIR, "module_2.pdf")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    doc = fitz.open(pdf_path)
+    pixmaps = [render_page(doc, i) for i in range(min(len(doc), 20))]
+    print(f"{os.path.basename(pdf_path)}: {len(pixmaps)} pages at {pixmaps[0].width}x{pixmaps[0].height}")
+
+    old_ms, old_bytes = measure("copy + rescale every frame", pixmaps, flip_copy_and_rescale)
+    # Each distinct step is one full-page scale per flip, so cost follows PDF_FLIP_STEPS;
+    # fewer steps are cheaper but make the zoom-out visibly coarser
+    results = {}
+    for steps in sorted({1, 2, PDF_FLIP_STEPS}):
+        flip = FlipAnimation(steps=steps)
+        label = f"zero-copy, {steps} step(s)" + (" *" if steps == PDF_FLIP_STEPS else "")
+        results[steps] = measure(label, pixmaps, lambda pix: flip_zero_copy_cached(pix, flip))
+
+    new_ms, new_bytes = results[PDF_FLIP_STEPS]
+    print(f"CPU per flip at PDF_FLIP_STEPS={PDF_FLIP_STEPS} (*): {old_ms / new_ms:.1f}x less")
+    for steps, (ms, _) in results.items():
+        if steps != PDF_FLIP_STEPS:
+            print(f"  at {steps} step(s): {old_ms / ms:.1f}x less")
+    print(f"Allocation per flip: {old_bytes / 1024:.0f} KiB -> {new_bytes / 1024:.0f} KiB")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+DefenseShot: Elite Sniper Academy
+Question bank benchmark - quiz start cost, JSON source vs compiled bank
+
+Run with: python benchmarks/bench_question_bank.py [questions per bank]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz.bank import ModuleBank, bank_path
+from quiz.compiled import compile_bank, open_bank
+
+MODULE = 1
+SAMPLE = 10
+RUNS = 20
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+
+def write_synthetic_bank(mcq_dir, size):
+    rng = random.Random(7)
+    with open(bank_path(MODULE, mcq_dir), "w", encoding="utf-8") as f:
+        for n in range(size):
+            record = {
+                'id': f"m01-{n:06d}",
+                'question': f"Synthetic question {n} about sector {rng.randint(1, 999)} and its defences?",
+                'options': [f"{letter}. Option {letter} for item {n}" for letter in "ABCD"],
+                'answer': rng.choice("ABCD"),
+                'difficulty': rng.choice(DIFFICULTIES),
+                'category': f"Category {rng.randint(1, 40)}"
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def measure(label, start_quiz):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        start_quiz()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    start_quiz()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times.sort()
+    print(f"{label:<28} median {times[len(times) // 2]:>9.3f} ms   peak alloc {peak // 1024:>8} KiB")
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as work:
+        mcq_dir = os.path.join(work, "mcqs")
+        compiled_dir = os.path.join(work, "compiled")
+        os.makedirs(mcq_dir)
+        write_synthetic_bank(mcq_dir, size)
+        start = time.perf_counter()
+        compile_bank(MODULE, mcq_dir, compiled_dir)
+        print(f"{size} questions, compiled once in {time.perf_counter() - start:.2f}s\n")
+
+        measure("JSON load + sample", lambda: ModuleBank.load(MODULE, mcq_dir).sample(SAMPLE))
+
+        def compiled_start():
+            bank = open_bank(MODULE, mcq_dir, compiled_dir)
+            bank.sample(SAMPLE)
+            bank.close()
+
+        measure("compiled open + sample", compiled_start)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
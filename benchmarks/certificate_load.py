@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+DefenseShot: Elite Sniper Academy
+Certificate service load test - request mixes at set concurrency, checked against a baseline
+
+Drives the certificate app (modules/module11.py) in-process through Flask's
+test client, so no server, browser or network is involved. For each
+concurrency level a fixed, seeded sequence of requests is replayed from
+that many threads:
+- page: GET / with gzip;
+- generate: POST /generate;
+- preview: GET /preview/<id>, half of them repeat views with If-None-Match;
+- download: GET /download/<id>;
+- verify: GET /verify/<id>.
+
+For each level it reports throughput, per-operation latency percentiles and
+histograms, 429s, failures, peak RSS and the size of the certificate store.
+
+Run with:           python benchmarks/certificate_load.py --levels 1,8,32 --requests 200
+Record a baseline:  python benchmarks/certificate_load.py --save-baseline
+Later runs compare against the baseline when their settings match. They
+exit with status 1 when throughput, a p99 or peak RSS is more than
+--tolerance worse.
+In CI:              python benchmarks/certificate_load.py --require-baseline
+Baselines are machine-specific, so none is committed. With
+--require-baseline, a missing baseline, or one recorded with other
+settings, also exits with status 1 instead of passing unchecked.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modules"))
+
+import certificates.preview as preview
+import certificates.registry as registry
+import certificates.store as store
+import db.database as database
+import module11
+
+OPERATIONS = ("page", "generate", "preview", "download", "verify")
+DEFAULT_MIX = "page=1,generate=2,preview=5,download=2,verify=5"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "certificate_load_baseline.json")
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)  # Histogram upper bounds
+COURSES = ("Learning About Armed Forces", "Advanced Marksmanship", "Tactical Operations", "Military Leadership")
+BROWSER_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+
+
+def parse_mix(text):
+    """'page=1,generate=2' -> {'page': 1, 'generate': 2}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation {name!r} in mix; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def trainee(rng):
+    start = f"2026-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}"
+    return {'studentName': f"Trainee {rng.randint(1, 100000):06d}", 'startDate': start,
+            'endDate': start.replace("2026", "2027"), 'institution': "DefenseShot Elite Sniper Academy",
+            'course': rng.choice(COURSES)}
+
+
+class Run:
+    """Shared state of one level: issued certificates, ETags seen and measurements"""
+
+    def __init__(self, issued):
+        self.issued = issued  # cert ids available to preview, download and verify
+        self.etags = {}  # cert id -> preview ETag a "browser" already holds
+        self.latency = collections.defaultdict(list)  # operation -> [ms]
+        self.statuses = collections.defaultdict(collections.Counter)  # operation -> status -> count
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def client(self):
+        if not hasattr(self.local, "client"):
+            self.local.client = module11.app.test_client()
+        return self.local.client
+
+    def request(self, operation, seed):
+        rng = random.Random(seed)
+        client = self.client()
+        with self.lock:
+            cert_id = rng.choice(self.issued)
+            etag = self.etags.get(cert_id) if rng.random() < 0.5 else None
+
+        start = time.perf_counter()
+        if operation == "page":
+            response = client.get("/", headers={'Accept-Encoding': "gzip"})
+        elif operation == "generate":
+            response = client.post("/generate", json=trainee(rng))
+        elif operation == "preview":
+            headers = {'Accept': BROWSER_ACCEPT}
+            if etag:
+                headers['If-None-Match'] = etag
+            response = client.get(f"/preview/{cert_id}", headers=headers)
+        elif operation == "download":
+            response = client.get(f"/download/{cert_id}")
+        else:
+            response = client.get(f"/verify/{cert_id}")
+        response.get_data()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        with self.lock:
+            self.latency[operation].append(elapsed)
+            self.statuses[operation][response.status_code] += 1
+            if operation == "generate" and response.status_code == 200:
+                self.issued.append(response.get_json()['certificateId'])
+            elif operation == "preview" and response.status_code == 200:
+                self.etags[cert_id] = response.headers['ETag']
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS, KiB elsewhere
+
+
+def percentile(values, q):
+    index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+    return values[index]
+
+
+def histogram(values):
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(BUCKETS_MS) if value <= bound), len(BUCKETS_MS))] += 1
+    return counts
+
+
+def run_level(concurrency, sequence, issued, seed):
+    run = Run(issued)
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run.request, operation, seed * 1000003 + n) for n, operation in enumerate(sequence)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    stats = store.get_store().stats()
+    level = {'throughput': round(len(sequence) / elapsed, 2), 'elapsed': round(elapsed, 3), 'ops': {},
+             'peak_rss_kb': peak_rss_kb(), 'store_bytes': stats['bytes'], 'store_entries': stats['entries']}
+    for operation, values in run.latency.items():
+        values.sort()
+        statuses = run.statuses[operation]
+        level['ops'][operation] = {
+            'count': len(values),
+            'p50': round(percentile(values, 0.5), 2),
+            'p95': round(percentile(values, 0.95), 2),
+            'p99': round(percentile(values, 0.99), 2),
+            'max': round(values[-1], 2),
+            'histogram': histogram(values),
+            'rejected': statuses[429],
+            'failed': sum(count for status, count in statuses.items() if status >= 400 and status != 429),
+            'not_modified': statuses[304]
+        }
+    return level
+
+
+def report(concurrency, level):
+    rss = f"{level['peak_rss_kb'] / 1024:.0f} MiB" if level['peak_rss_kb'] else "n/a"
+    print(f"\nConcurrency {concurrency}: {level['throughput']:.1f} requests/s over {level['elapsed']:.1f}s, "
+          f"peak RSS {rss}, store {level['store_entries']} certificates / {level['store_bytes'] / 1048576:.1f} MiB")
+    print(f"{'operation':<10} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'304':>5} {'429':>5} "
+          f"{'failed':>6}")
+    for operation in OPERATIONS:
+        op = level['ops'].get(operation)
+        if op:
+            print(f"{operation:<10} {op['count']:>6} {op['p50']:>8.1f} {op['p95']:>8.1f} {op['p99']:>8.1f} "
+                  f"{op['max']:>8.1f} {op['not_modified']:>5} {op['rejected']:>5} {op['failed']:>6}")
+    labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+    print(f"{'ms':<10} " + " ".join(f"{label:>6}" for label in labels))
+    for operation in OPERATIONS:
+        op = level['ops'].get(operation)
+        if op:
+            print(f"{operation:<10} " + " ".join(f"{count:>6}" for count in op['histogram']))
+
+
+def regressions(results, baseline, tolerance):
+    """Descriptions of every measurement more than tolerance worse than the baseline"""
+    found = []
+    for concurrency, level in results['levels'].items():
+        before = baseline['levels'].get(concurrency)
+        if before is None:
+            continue
+        if level['throughput'] < before['throughput'] * (1 - tolerance):
+            found.append(f"concurrency {concurrency}: throughput {level['throughput']:.1f}/s, "
+                         f"baseline {before['throughput']:.1f}/s")
+        if level['peak_rss_kb'] and before.get('peak_rss_kb') and \
+                level['peak_rss_kb'] > before['peak_rss_kb'] * (1 + tolerance):
+            found.append(f"concurrency {concurrency}: peak RSS {level['peak_rss_kb']} KiB, "
+                         f"baseline {before['peak_rss_kb']} KiB")
+        for operation, op in level['ops'].items():
+            old = before['ops'].get(operation)
+            if old and op['p99'] > old['p99'] * (1 + tolerance):
+                found.append(f"concurrency {concurrency}: {operation} p99 {op['p99']:.1f} ms, "
+                             f"baseline {old['p99']:.1f} ms")
+            if op['failed']:
+                found.append(f"concurrency {concurrency}: {op['failed']} failed {operation} request(s)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the certificate service in-process")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--levels", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per level")
+    parser.add_argument("--warm", type=int, default=10, help="certificates issued before the first level")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="fail when there is no baseline with matching settings to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in args.levels.split(",")]
+
+    # A private database and a store spilling to a temporary directory; nothing touches user_data
+    work = tempfile.TemporaryDirectory()
+    database.DB_PATH = os.path.join(work.name, "certificates.db")
+    database.init_db()
+    store._store = store.CertificateStore(spill_dir=work.name)
+    preview._previews = preview.PreviewCache()
+    registry._registry = registry.CertificateRegistry()
+
+    client = module11.app.test_client()
+    rng = random.Random(args.seed)
+    issued = []
+    for _ in range(args.warm):
+        issued.append(client.post("/generate", json=trainee(rng)).get_json()['certificateId'])
+
+    config = {'mix': mix, 'requests': args.requests, 'warm': args.warm, 'seed': args.seed}
+    results = {'config': config, 'levels': {}}
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    for concurrency in levels:
+        sequence = random.Random(args.seed + concurrency).choices(names, weights, k=args.requests)
+        level = run_level(concurrency, sequence, issued, args.seed + concurrency)
+        results['levels'][str(concurrency)] = level
+        report(concurrency, level)
+    work.cleanup()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    unchecked = 1 if args.require_baseline else 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return unchecked
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get('config') != config:
+        print(f"\nBaseline {args.baseline} was recorded with different settings; not compared")
+        return unchecked
+    found = regressions(results, baseline, args.tolerance)
+    if found:
+        print(f"\nRegressed past the baseline (tolerance {args.tolerance:.0%}):")
+        for line in found:
+            print(f"  {line}")
+        return 1
+    print(f"\nWithin {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
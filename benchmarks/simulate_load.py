@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+DefenseShot: Elite Sniper Academy
+Load simulator - many synthetic trainees taking quizzes against one database
+
+Each trainee has a true ability on the adaptive quiz's logit scale and a
+pace (mean seconds per answer). It works through the modules in order,
+retrying a failed quiz, through the same code a kiosk runs: AdaptiveQuiz,
+AnswerTelemetry and quiz.completion.save_finished_quiz, the single
+transaction that writes a finished quiz to the academy database and the
+attached module database. No pygame is needed.
+
+Run with: python benchmarks/simulate_load.py --trainees 5000 --workers 64
+
+Think time is multiplied by --time-scale (default 0.001, so an 8 s answer
+takes 8 ms). Both databases are fresh temporary files unless --db is given;
+the module database then sits next to it as <db>.modules.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db.database as database
+from config import TOTAL_MODULES
+from quiz.adaptive import AdaptiveQuiz, p_correct
+from quiz.bank import get_bank
+from quiz.completion import save_finished_quiz
+from quiz.telemetry import AnswerTelemetry
+
+SLOW_MS = 50  # An uncontended call takes a few ms; slower ones were waiting on the write lock
+REPORTED = ("save_finished_quiz", "get_user_stats")
+
+# The in-memory item index is per process and, in the app, used by one
+# trainee at a time; simulated trainees in one process take turns on it
+_quiz_lock = threading.Lock()
+
+
+class Trainee:
+    __slots__ = ('user_id', 'ability', 'pace', 'seed')
+
+    def __init__(self, user_id, ability, pace, seed):
+        self.user_id = user_id
+        self.ability = ability
+        self.pace = pace
+        self.seed = seed
+
+
+class Results:
+    """Latencies and counts from one or more workers"""
+
+    def __init__(self):
+        self.latency = collections.defaultdict(list)  # operation -> [ms]
+        self.failures = collections.Counter()
+        self.quizzes = 0
+        self.answers = 0
+        self.passed = 0
+
+    def merge(self, other):
+        for name, values in other.latency.items():
+            self.latency[name].extend(values)
+        self.failures.update(other.failures)
+        self.quizzes += other.quizzes
+        self.answers += other.answers
+        self.passed += other.passed
+
+    def timed(self, name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.latency[name].append((time.perf_counter() - start) * 1000)
+        if result is False or result is None:
+            self.failures[name] += 1
+        return result
+
+
+def init_module_db(path, modules):
+    """The tables a module's init_database() creates in defense_training.db, for save_finished_quiz"""
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS modules (
+            id INTEGER PRIMARY KEY, name TEXT, description TEXT, is_locked INTEGER DEFAULT 1,
+            required_score INTEGER DEFAULT 80
+        );
+        CREATE TABLE IF NOT EXISTS user_progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, module_id INTEGER, score INTEGER,
+            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, is_unlocked INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS quiz_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, module_id INTEGER, score INTEGER,
+            total_questions INTEGER, time_taken INTEGER, completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+    conn.executemany('INSERT OR IGNORE INTO modules (id, name) VALUES (?, ?)',
+                     [(n, f"Module {n}") for n in range(1, modules + 1)])
+    conn.commit()
+    conn.close()
+
+
+def take_quiz(trainee, module_number, rng, time_scale, results, module_db):
+    """One quiz, answered at the trainee's pace; returns True if passed"""
+    virtual_ms = [0]
+    telemetry = AnswerTelemetry(trainee.user_id, module_number, lambda: virtual_ms[0])
+    quiz = AdaptiveQuiz(get_bank().module(module_number), trainee.user_id)
+
+    while not quiz.is_decided():
+        with _quiz_lock:
+            question = quiz.next_question()
+        if question is None:
+            break
+        telemetry.question_shown(question)
+        think = rng.expovariate(1.0 / trainee.pace)
+        virtual_ms[0] += int(think * 1000)
+        time.sleep(think * time_scale)
+
+        correct = rng.random() < p_correct(trainee.ability, quiz.index.difficulty[quiz.current])
+        chosen = question.answer if correct else rng.choice(
+            [chr(ord("A") + i) for i in range(len(question.options)) if chr(ord("A") + i) != question.answer])
+        telemetry.option_selected(chosen)
+        with _quiz_lock:
+            quiz.record(correct)
+        telemetry.answer_submitted(correct)
+        results.answers += 1
+
+    # Everything a kiosk writes when a quiz ends, in its one transaction
+    results.timed("save_finished_quiz", save_finished_quiz, quiz, telemetry, quiz.score, quiz.answered,
+                  virtual_ms[0] // 1000, quiz.passed, module_db)
+    results.timed("get_user_stats", database.get_user_stats, trainee.user_id)
+    results.quizzes += 1
+    if quiz.passed:
+        results.passed += 1
+    return quiz.passed
+
+
+def run_trainee(trainee, modules, max_attempts, time_scale, module_db):
+    rng = random.Random(trainee.seed)
+    results = Results()
+    for module_number in range(1, modules + 1):
+        for _ in range(max_attempts):
+            if take_quiz(trainee, module_number, rng, time_scale, results, module_db):
+                break
+        else:
+            break  # Stuck on this module
+    return results
+
+
+def run_chunk(db_path, module_db, trainees, workers, modules, max_attempts, time_scale):
+    """Run trainees on a thread pool; also the entry point of each worker process"""
+    database.DB_PATH = db_path
+    results = Results()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_trainee, trainee, modules, max_attempts, time_scale, module_db)
+                   for trainee in trainees]
+        for future in concurrent.futures.as_completed(futures):
+            results.merge(future.result())
+    return results
+
+
+def create_trainees(count, ability_mean, ability_sd, pace, seed):
+    rng = random.Random(seed)
+    trainees = []
+    for n in range(count):
+        ok, message = database.register_user(f"sim_{seed}_{n:05d}", "simulated")
+        if not ok:
+            raise SystemExit(f"Could not create trainee {n}: {message}")
+        conn = database.get_db_connection()
+        user_id = conn.execute('SELECT id FROM users WHERE username = ?', (f"sim_{seed}_{n:05d}",)).fetchone()['id']
+        conn.close()
+        # Pace varies about 2x either way between trainees
+        trainees.append(Trainee(user_id, rng.gauss(ability_mean, ability_sd), pace * math.exp(rng.gauss(0, 0.35)),
+                                rng.getrandbits(32)))
+    return trainees
+
+
+def db_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal", path + "-journal") if os.path.exists(p))
+
+
+def sample_growth(db_path, module_db, started, interval, done, samples):
+    while not done.wait(interval):
+        try:
+            conn = database.get_db_connection()
+            conn.execute('ATTACH DATABASE ? AS results', (module_db,))
+            quizzes = conn.execute('SELECT COUNT(*) FROM results.quiz_results').fetchone()[0]
+            events = conn.execute('SELECT COUNT(*) FROM answer_events').fetchone()[0]
+            conn.close()
+        except Exception:
+            continue  # Busy; the next sample will do
+        samples.append((time.perf_counter() - started, quizzes, events, db_size(db_path) + db_size(module_db)))
+
+
+def percentile(values, q):
+    index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+    return values[index]
+
+
+def report(results, elapsed, samples, db_path, module_db, size_before):
+    print(f"\n{results.quizzes} quizzes, {results.answers} answers, {results.passed} passed in {elapsed:.1f}s")
+    print(f"Throughput: {results.quizzes / elapsed:.1f} quizzes/s, {results.answers / elapsed:.1f} answers/s\n")
+
+    print(f"{'operation':<20} {'calls':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  "
+          f"{'>' + str(SLOW_MS) + ' ms':>8} {'failed':>7}")
+    for name in REPORTED:
+        values = sorted(results.latency.get(name, []))
+        if not values:
+            continue
+        slow = len(values) - sum(1 for value in values if value <= SLOW_MS)
+        print(f"{name:<20} {len(values):>7} {percentile(values, 0.5):>8.2f} {percentile(values, 0.95):>8.2f} "
+              f"{percentile(values, 0.99):>8.2f} {values[-1]:>8.2f}  {slow:>8} {results.failures[name]:>7}")
+    print(f"(milliseconds; '>{SLOW_MS} ms' counts calls that waited on a lock, 'failed' those that gave up "
+          f"with 'database is locked')\n")
+
+    print(f"{'time':>7} {'quizzes':>8} {'answers':>9} {'db size':>10}")
+    print(f"{0.0:>6.1f}s {0:>8} {0:>9} {size_before / 1024:>8.0f} KiB")
+    step = max(1, len(samples) // 20)
+    for at, quizzes, events, size in samples[::step]:
+        print(f"{at:>6.1f}s {quizzes:>8} {events:>9} {size / 1024:>8.0f} KiB")
+    size = db_size(db_path) + db_size(module_db)
+    print(f"{elapsed:>6.1f}s {'end':>8} {'':>9} {size / 1024:>8.0f} KiB  "
+          f"(+{(size - size_before) / max(1, results.quizzes):.0f} bytes per quiz)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many trainees taking quizzes at once")
+    parser.add_argument("--trainees", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=32, help="concurrent trainees per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--modules", type=int, default=TOTAL_MODULES, help="how far trainees may progress")
+    parser.add_argument("--attempts", type=int, default=3, help="tries per module before a trainee gives up")
+    parser.add_argument("--ability-mean", type=float, default=1.0)
+    parser.add_argument("--ability-sd", type=float, default=1.0)
+    parser.add_argument("--pace", type=float, default=8.0, help="mean seconds per answer")
+    parser.add_argument("--time-scale", type=float, default=0.001, help="0 answers without pausing")
+    parser.add_argument("--sample-every", type=float, default=1.0, help="seconds between DB size samples")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", help="database file (default: a new temporary one)")
+    args = parser.parse_args()
+
+    work = None
+    if args.db:
+        db_path = os.path.abspath(args.db)
+    else:
+        work = tempfile.TemporaryDirectory()
+        db_path = os.path.join(work.name, "simulation.db")
+    module_db = db_path + ".modules"
+    database.DB_PATH = db_path
+    database.init_db()
+    init_module_db(module_db, args.modules)
+
+    print(f"Creating {args.trainees} trainees in {db_path}")
+    trainees = create_trainees(args.trainees, args.ability_mean, args.ability_sd, args.pace, args.seed)
+    get_bank()  # Load the banks before the clock starts
+    size_before = db_size(db_path) + db_size(module_db)
+
+    samples = []
+    done = threading.Event()
+    started = time.perf_counter()
+    sampler = threading.Thread(target=sample_growth, args=(db_path, module_db, started, args.sample_every, done, samples),
+                               daemon=True)
+    sampler.start()
+
+    run_args = (args.workers, args.modules, args.attempts, args.time_scale)
+    if args.processes > 1:
+        results = Results()
+        chunks = [trainees[i::args.processes] for i in range(args.processes)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.processes) as pool:
+            for chunk_results in pool.map(run_chunk, [db_path] * len(chunks), [module_db] * len(chunks), chunks,
+                                          *[[value] * len(chunks) for value in run_args]):
+                results.merge(chunk_results)
+    else:
+        results = run_chunk(db_path, module_db, trainees, *run_args)
+
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    report(results, elapsed, samples, db_path, module_db, size_before)
+
+    if work is not None:
+        work.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
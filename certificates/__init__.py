@@ -0,0 +1,4 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificates package - rendering and serving course completion certificates
+"""
@@ -0,0 +1,48 @@
+"""
+DefenseShot: Elite Sniper Academy
+Static responses for the certificate web app - built once, served as bytes
+
+Each asset is encoded and gzipped once at startup, with its ETag. A request
+then costs a header check and a write: 304 when the browser's copy is
+current, otherwise the gzipped or plain bytes as Accept-Encoding allows.
+The stylesheet and script are served under names carrying their content
+hash, so they can be cached for good; the page itself is revalidated.
+"""
+
+import gzip
+import hashlib
+
+from flask import Response
+
+IMMUTABLE = 'public, max-age=31536000, immutable'  # Fingerprinted: new content gets a new URL
+REVALIDATE = 'no-cache'  # Stored, but checked with the server (a 304) before each use
+
+
+class StaticAsset:
+    """One response body, kept plain and gzipped, with a strong ETag for each"""
+
+    def __init__(self, body, mimetype, cache_control=REVALIDATE):
+        self.data = body.encode("utf-8")
+        self.gzipped = gzip.compress(self.data, compresslevel=9, mtime=0)
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(self.data).hexdigest()[:32]
+        self.fingerprint = self.etag[:12]
+
+    def url_name(self, name, extension):
+        """File name carrying the content hash, e.g. certificate.3f2a9c1b04de.css"""
+        return f"{name}.{self.fingerprint}.{extension}"
+
+    def response(self, request):
+        gzipped = bool(request.accept_encodings['gzip'])
+        etag = self.etag + "-gz" if gzipped else self.etag  # Different bytes, different strong ETag
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.gzipped if gzipped else self.data, mimetype=self.mimetype)
+            if gzipped:
+                response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept-Encoding')
+        return response
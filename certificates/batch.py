@@ -0,0 +1,220 @@
+"""
+DefenseShot: Elite Sniper Academy
+Cohort certificates - rendered in worker processes and streamed into a ZIP
+
+Certificates are handed to a process pool a few per worker at a time and
+written to the archive as they finish; each finished file is passed on
+(to the HTTP response or the output file) before the next is added. Memory
+use depends on the number of workers, not on the size of the cohort.
+
+Worker processes are started from a fork server (spawned where there is
+none), never forked from the caller. The web app has request and render
+threads running, and a forked child can inherit a lock one of them held
+and hang on it. The web app shares one pool across requests and builds at
+most CERTIFICATE_BATCHES archives at a time; admit_batch() refuses the
+rest with QueueFull.
+
+Everyone who has completed every module:  python -m certificates.batch --completed -o cohort.zip
+From a roster:                            python -m certificates.batch --roster roster.csv -o cohort.zip
+
+Roster CSV columns: student_name, start_date, end_date, institution, course
+(end_date, institution and course may be left empty).
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import zipfile
+from datetime import date
+
+from certificates.jobs import QueueFull
+from certificates.pdf import certificate_filename, certificate_pdf, warm_up
+from config import CERTIFICATE_BATCHES
+from db.database import get_graduates
+
+DEFAULT_INSTITUTION = "DefenseShot Elite Sniper Academy"
+DEFAULT_COURSE = "Learning About Armed Forces"
+IN_FLIGHT_PER_WORKER = 2  # Enough to keep every worker busy; caps finished-but-unwritten files
+BATCH_RETRY_AFTER = 30  # Seconds a refused batch request is told to wait
+POOL_WORKERS = os.cpu_count() or 1  # Size of the shared pool
+
+
+def roster_entry(student_name, start_date, end_date="", institution="", course=""):
+    """One certificate's details, defaults filled in; ValueError if name or start date is missing"""
+    student_name = (student_name or "").strip()
+    start_date = (start_date or "").strip()
+    if not student_name or not start_date:
+        raise ValueError(f"roster entry {student_name or '(no name)'!r} needs a name and a start date")
+    return {
+        'student_name': student_name,
+        'start_date': start_date,
+        'end_date': (end_date or "").strip() or date.today().isoformat(),
+        'institution': (institution or "").strip() or DEFAULT_INSTITUTION,
+        'course': (course or "").strip() or DEFAULT_COURSE
+    }
+
+
+def read_roster(path):
+    """Entries from a roster CSV, one row at a time"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield roster_entry(row.get('student_name'), row.get('start_date'), row.get('end_date'),
+                               row.get('institution'), row.get('course'))
+
+
+def graduate_entries():
+    """Entries for every trainee who has completed all modules"""
+    return [roster_entry(graduate['username'], graduate['start_date'], graduate['end_date'])
+            for graduate in get_graduates()]
+
+
+def render_entry(entry):
+    """PDF bytes for one entry; runs in a worker process"""
+    return certificate_pdf(entry['student_name'], entry['start_date'], entry['end_date'],
+                           entry['institution'], entry['course']).getvalue()
+
+
+def _warm_up():
+    warm_up()  # Background and font once per worker, before the first certificate
+
+
+def new_pool(workers):
+    """Process pool whose workers never start as a fork of this process"""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_warm_up)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_batches = threading.BoundedSemaphore(CERTIFICATE_BATCHES)
+
+
+def get_pool():
+    """Shared process pool of POOL_WORKERS workers for the running process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = new_pool(POOL_WORKERS)
+    return _pool
+
+
+def admit_batch():
+    """Claim a batch slot, returning the function that gives it back; QueueFull when all are taken"""
+    if not _batches.acquire(blocking=False):
+        raise QueueFull(BATCH_RETRY_AFTER)
+    return _batches.release
+
+
+def render_stream(entries, workers=None, pool=None):
+    """(position, entry, pdf bytes) in the order certificates finish
+
+    With pool (from get_pool()) the certificates are rendered there and the
+    pool is left running; otherwise a pool of workers processes is started
+    for this stream.
+    """
+    if pool is not None:
+        yield from _render(pool, POOL_WORKERS, entries)
+        return
+    workers = workers or os.cpu_count() or 1
+    with new_pool(workers) as pool:
+        yield from _render(pool, workers, entries)
+
+
+def _render(pool, workers, entries):
+    entries = iter(enumerate(entries, 1))
+    pending = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                item = next(entries, None)
+                if item is None:
+                    exhausted = True
+                else:
+                    pending[pool.submit(render_entry, item[1])] = item
+            if not pending:
+                return
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                position, entry = pending.pop(future)
+                yield position, entry, future.result()
+    finally:
+        # A download that stops early leaves the shared pool nothing more of it to do
+        for future in pending:
+            future.cancel()
+
+
+class _ChunkSink:
+    """Write-only file for ZipFile that hands over what was written so far"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def zip_stream(entries, workers=None, pool=None):
+    """The cohort's ZIP archive as a stream of byte chunks
+
+    The sink cannot seek, so ZipFile writes sizes after each file's data
+    and nothing has to be held back until the end. PDFs are already
+    compressed and are stored as they are.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for position, entry, pdf in render_stream(entries, workers, pool):
+            info = zipfile.ZipInfo(f"{position:05d}_{certificate_filename(entry['student_name'])}",
+                                   date_time=time.localtime()[:6])
+            archive.writestr(info, pdf)
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a ZIP of certificates for a whole cohort")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--roster", help="CSV file with one trainee per row")
+    source.add_argument("--completed", action="store_true", help="everyone who has completed every module")
+    parser.add_argument("-o", "--output", required=True, help="ZIP file to write")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    entries = read_roster(args.roster) if args.roster else graduate_entries()
+    count = 0
+
+    def counted(items):
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+
+    start = time.perf_counter()
+    try:
+        with open(args.output, "wb") as f:
+            for chunk in zip_stream(counted(entries), args.workers):
+                f.write(chunk)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} certificate(s) to {args.output} in {elapsed:.1f}s ({count / elapsed:.1f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate fonts - one lookup per face, one FreeTypeFont per (face, size)
+
+Each face has a fallback chain of font files. The chain is searched once,
+in assets/fonts first and then the usual system font directories, and the
+resolved path is kept. Fonts and text measurements are cached, so after
+warm-up rendering a certificate opens no font files. When no file in a
+chain exists anywhere, Pillow's built-in scalable font is used instead of
+the tiny bitmap one (Pillow 10.1 and later; older versions only have the
+bitmap font).
+
+Show what each face resolves to:  python -m certificates.fonts
+"""
+
+import os
+import sys
+import threading
+
+from PIL import ImageFont
+
+from config import ASSETS_DIR
+
+FACES = {
+    'sans': ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf", "NotoSans-Regular.ttf",
+             "FreeSans.ttf", "Helvetica.ttc"),
+}
+
+BUNDLED_DIR = os.path.join(ASSETS_DIR, "fonts")
+WIDTH_CACHE_SIZE = 4096  # Measured strings kept per registry; the cache starts over when full
+
+
+def system_font_dirs():
+    dirs = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+            os.path.expanduser("~/.local/share/fonts"), "/Library/Fonts", "/System/Library/Fonts",
+            os.path.expanduser("~/Library/Fonts")]
+    windir = os.environ.get("WINDIR")
+    if windir:
+        dirs.append(os.path.join(windir, "Fonts"))
+    return [directory for directory in dirs if os.path.isdir(directory)]
+
+
+def default_font(size):
+    """Pillow's built-in font at size; before Pillow 10.1 only the fixed-size bitmap font exists"""
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+class FontRegistry:
+    """Resolves faces to files once and caches fonts by (face, size)"""
+
+    def __init__(self, font_dirs=None):
+        self.font_dirs = font_dirs if font_dirs is not None else [BUNDLED_DIR] + system_font_dirs()
+        self.files = None  # lower-case file name -> path, first directory wins
+        self.paths = {}
+        self.fonts = {}
+        self.widths = {}  # (face, size, text) -> ink width
+        self.lock = threading.Lock()
+
+    def _index(self):
+        files = {}
+        for directory in self.font_dirs:
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    files.setdefault(name.lower(), os.path.join(root, name))
+        return files
+
+    def path(self, face):
+        """File for face, or None when nothing in its chain is installed"""
+        if face not in self.paths:
+            with self.lock:
+                if self.files is None:
+                    self.files = self._index()
+                self.paths[face] = next((self.files[name.lower()] for name in FACES[face]
+                                         if name.lower() in self.files), None)
+        return self.paths[face]
+
+    def font(self, face, size):
+        font = self.fonts.get((face, size))
+        if font is None:
+            path = self.path(face)
+            try:
+                font = ImageFont.truetype(path, size) if path else default_font(size)
+            except OSError as e:
+                print(f"Error loading font {path}: {e}")
+                font = default_font(size)
+            self.fonts[(face, size)] = font
+        return font
+
+    def text_width(self, face, size, text):
+        """Ink width of text, memoized: fixed strings are measured once per registry"""
+        key = (face, size, text)
+        width = self.widths.get(key)
+        if width is None:
+            bbox = self.font(face, size).getbbox(text)
+            width = bbox[2] - bbox[0]
+            if len(self.widths) >= WIDTH_CACHE_SIZE:
+                self.widths.clear()
+            self.widths[key] = width
+        return width
+
+
+_registry = None
+
+
+def get_registry():
+    """Shared FontRegistry for the running process"""
+    global _registry
+    if _registry is None:
+        _registry = FontRegistry()
+    return _registry
+
+
+def main():
+    registry = get_registry()
+    for face in FACES:
+        print(f"{face:<10} {registry.path(face) or 'Pillow built-in font (none of: ' + ', '.join(FACES[face]) + ')'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
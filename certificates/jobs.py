@@ -0,0 +1,186 @@
+"""
+DefenseShot: Elite Sniper Academy
+Render queue - certificate work on a fixed pool of worker threads, with admission control
+
+Request threads never render. They hand the work to a RenderQueue, which
+runs CERTIFICATE_WORKERS renders at a time and lets up to
+CERTIFICATE_QUEUE_LIMIT more wait. Past that, submit() raises QueueFull
+with a Retry-After estimate made from recent render times. The web app
+turns that into a 429. A burst after a ceremony is therefore queued and
+refused at a fixed limit instead of spreading over more threads than the
+machine has cores.
+
+Tracked jobs can be polled by id until JOB_TTL after they finish.
+"""
+
+import collections
+import math
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import CERTIFICATE_WORKERS, CERTIFICATE_QUEUE_LIMIT, JOB_TTL
+
+LATENCY_SAMPLES = 1000  # Most recent renders the percentiles are taken over
+
+
+class QueueFull(Exception):
+    """The queue is at its limit; retry_after is a whole number of seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"render queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    __slots__ = ('job_id', 'state', 'result', 'error', 'submitted_at', 'finished_at', 'done')
+
+    def __init__(self, job_id, submitted_at):
+        self.job_id = job_id
+        self.state = 'queued'  # queued -> running -> done | failed
+        self.result = None
+        self.error = None
+        self.submitted_at = submitted_at
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """True once the job has finished"""
+        return self.done.wait(timeout)
+
+    def outcome(self):
+        """The result of a finished job, or its exception raised again"""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def to_dict(self):
+        status = {'jobId': self.job_id, 'status': self.state}
+        if self.state == 'done':
+            status['result'] = self.result
+        elif self.state == 'failed':
+            status['error'] = str(self.error)
+        return status
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of samples, or None when there are none"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class RenderQueue:
+    """Bounded pool of render threads with an admission limit and job tracking"""
+
+    def __init__(self, workers=CERTIFICATE_WORKERS, max_queued=CERTIFICATE_QUEUE_LIMIT, job_ttl=JOB_TTL,
+                 clock=time.monotonic):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.job_ttl = job_ttl
+        self.clock = clock
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="certificate-render")
+        self.jobs = {}  # job_id -> Job, for tracked jobs
+        self.finished = collections.deque()  # (finished_at, job_id) of tracked jobs, in completion order
+        self.pending = 0  # Queued plus running
+        self.running = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)  # Seconds spent rendering
+        self.waits = collections.deque(maxlen=LATENCY_SAMPLES)  # Seconds spent queued
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) as a job that can be polled by id; QueueFull when at the limit"""
+        return self._submit(fn, args, tracked=True)
+
+    def run(self, fn, *args):
+        """fn(*args) on a worker, waiting for it; QueueFull when at the limit"""
+        job = self._submit(fn, args, tracked=False)
+        job.wait()
+        return job.outcome()
+
+    def get(self, job_id):
+        with self.lock:
+            self._prune(self.clock())
+            return self.jobs.get(job_id)
+
+    def metrics(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            waits = list(self.waits)
+            metrics = {'workers': self.workers, 'max_queued': self.max_queued,
+                       'queue_depth': self.pending - self.running, 'running': self.running,
+                       'completed': self.completed, 'failed': self.failed, 'rejected': self.rejected}
+        for name, samples in (('render', latencies), ('wait', waits)):
+            for pct in (50, 99):
+                value = percentile(samples, pct)
+                metrics[f'{name}_p{pct}_ms'] = round(value * 1000, 1) if value is not None else None
+        return metrics
+
+    def _submit(self, fn, args, tracked):
+        now = self.clock()
+        with self.lock:
+            if self.pending >= self.workers + self.max_queued:
+                self.rejected += 1
+                raise QueueFull(self._retry_after())
+            self.pending += 1
+            job = Job(secrets.token_hex(8), now)
+            if tracked:
+                self._prune(now)
+                self.jobs[job.job_id] = job
+        self.pool.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        start = self.clock()
+        with self.lock:
+            job.state = 'running'
+            self.running += 1
+            self.waits.append(start - job.submitted_at)
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        with self.lock:
+            # Read under the lock so finished stays in completion order
+            end = self.clock()
+            self.pending -= 1
+            self.running -= 1
+            self.latencies.append(end - start)
+            job.result, job.error, job.finished_at = result, error, end
+            job.state = 'failed' if error is not None else 'done'
+            if error is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            if job.job_id in self.jobs:
+                self.finished.append((end, job.job_id))
+        job.done.set()
+
+    def _retry_after(self):
+        """Seconds until the queue has likely drained below the limit, at least 1"""
+        typical = percentile(self.latencies, 50) or 1.0
+        backlog = self.pending - self.workers + 1
+        return max(1, math.ceil(backlog * typical / self.workers))
+
+    def _prune(self, now):
+        """Forget jobs that finished more than job_ttl ago, however long the ones queued before them run"""
+        while self.finished and self.finished[0][0] + self.job_ttl <= now:
+            self.jobs.pop(self.finished.popleft()[1], None)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Shared RenderQueue for the running process"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RenderQueue()
+    return _queue
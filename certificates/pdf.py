@@ -0,0 +1,137 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate PDFs - the download format, drawn as vectors
+
+The border, corners, rules, seal and all text are ReportLab primitives in
+the template's pixel coordinates under one scale, so they stay sharp at
+any print size. The only raster is the camouflage background, encoded to
+JPEG once per process; ReportLab embeds JPEG data as it is, so no PDF
+decodes or re-encodes an image.
+"""
+
+import io
+import threading
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from certificates.fonts import get_registry
+from certificates.template import (WIDTH, HEIGHT, GOLD, LIGHT_GREEN, WHITE, FACE, TITLE_SIZE, SUBTITLE_SIZE,
+                                   TEXT_SIZE, NAME_SIZE, military_background)
+
+BACKGROUND_QUALITY = 85  # JPEG quality; the pattern sits under a dark overlay and hides artefacts
+PDF_FONT = 'CertificateSans'
+FALLBACK_PDF_FONT = 'Helvetica'  # When only Pillow's built-in font is available
+
+_background = None
+_font_name = None
+_lock = threading.Lock()
+
+
+def certificate_filename(student_name, extension="pdf"):
+    safe_name = "".join(c for c in student_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"DefenseShot_Certificate_{safe_name}.{extension}"
+
+
+def warm_up():
+    """Background JPEG bytes and PDF font name, prepared once"""
+    global _background, _font_name
+    with _lock:
+        if _background is None:
+            buffer = io.BytesIO()
+            military_background(WIDTH, HEIGHT).convert('RGB').save(buffer, format='JPEG', quality=BACKGROUND_QUALITY)
+            _background = buffer.getvalue()
+
+            path = get_registry().path(FACE)
+            _font_name = FALLBACK_PDF_FONT
+            if path and path.lower().endswith(".ttf"):
+                try:
+                    pdfmetrics.registerFont(TTFont(PDF_FONT, path))
+                    _font_name = PDF_FONT
+                except Exception as e:
+                    print(f"Error registering PDF font {path}: {e}")
+    return _background, _font_name
+
+
+def certificate_pdf(student_name, start_date, end_date, institution, course):
+    """A landscape A4 PDF of the certificate, as a rewound buffer"""
+    background, font = warm_up()
+    buffer = io.BytesIO()
+    pdf_width, pdf_height = landscape(A4)
+    c = canvas.Canvas(buffer, pagesize=landscape(A4))
+
+    # Template pixels -> points: uniform scale, centred in the 10 x 7 inch area the raster used
+    scale = min(10 * inch / WIDTH, 7 * inch / HEIGHT)
+    c.translate((pdf_width - WIDTH * scale) / 2, (pdf_height - HEIGHT * scale) / 2)
+    c.scale(scale, scale)
+
+    def y(top):
+        return HEIGHT - top  # Template y runs down the page, PDF y up
+
+    def text(top, string, color, size, x=None):
+        # Pillow places a line by the top of its ascender, ReportLab by its baseline
+        baseline = y(top) - pdfmetrics.getAscent(font, size)
+        c.setFillColor(color)
+        c.setFont(font, size)
+        if x is None:
+            c.drawCentredString(WIDTH / 2, baseline, string)
+        else:
+            c.drawString(x, baseline, string)
+
+    def rule(x1, top, x2, color, width):
+        c.setStrokeColor(color)
+        c.setLineWidth(width)
+        c.line(x1, y(top), x2, y(top))
+
+    c.drawImage(ImageReader(io.BytesIO(background)), 0, 0, width=WIDTH, height=HEIGHT)
+
+    # Border and corner decorations
+    c.setStrokeColor(GOLD)
+    c.setLineWidth(2)
+    for i in range(5):
+        c.rect(10 + i, 10 + i, WIDTH - 20 - 2 * i, HEIGHT - 20 - 2 * i, stroke=1, fill=0)
+    c.setFillColor(GOLD)
+    corner_size = 50
+    for cx, cy in [(20, 20), (WIDTH - 70, 20), (20, HEIGHT - 70), (WIDTH - 70, HEIGHT - 70)]:
+        path = c.beginPath()
+        path.moveTo(cx, y(cy))
+        path.lineTo(cx + corner_size, y(cy))
+        path.lineTo(cx + corner_size // 2, y(cy + corner_size // 2))
+        path.lineTo(cx, y(cy + corner_size))
+        path.close()
+        c.drawPath(path, stroke=0, fill=1)
+
+    text(80, "🎯 DEFENSESHOT ELITE SNIPER ACADEMY 🎯", GOLD, TITLE_SIZE)
+    text(140, "Certificate of Completion", LIGHT_GREEN, SUBTITLE_SIZE)
+    rule(200, 180, WIDTH - 200, GOLD, 3)
+    text(220, "This is to certify that", WHITE, TEXT_SIZE)
+    text(260, student_name, GOLD, NAME_SIZE)
+    rule(200, 310, WIDTH - 200, GOLD, 2)
+    text(340, "has successfully completed the", WHITE, TEXT_SIZE)
+    text(380, course, LIGHT_GREEN, NAME_SIZE)
+    rule(150, 430, WIDTH - 150, LIGHT_GREEN, 2)
+    text(460, f"at {institution}", WHITE, TEXT_SIZE)
+    text(500, f"Course Period: {start_date} to {end_date}", WHITE, TEXT_SIZE)
+    text(540, "In recognition of dedication, skill, and excellence", WHITE, TEXT_SIZE)
+
+    # Signature area
+    text(650, "Commanding Officer", WHITE, TEXT_SIZE, x=150)
+    rule(150, 680, 400, GOLD, 2)
+    text(650, "Date of Issue", WHITE, TEXT_SIZE, x=650)
+    rule(650, 680, 900, GOLD, 2)
+    text(690, end_date, GOLD, TEXT_SIZE, x=650)
+
+    # Academy seal (simplified) and motto
+    c.setStrokeColor(GOLD)
+    c.setLineWidth(3)
+    c.circle(150, y(750), 40, stroke=1, fill=0)
+    text(740, "🎯", GOLD, NAME_SIZE, x=135)
+    text(780, "PRECISION • DISCIPLINE • EXCELLENCE", GOLD, TEXT_SIZE)
+
+    c.save()
+    buffer.seek(0)
+    return buffer
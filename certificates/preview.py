@@ -0,0 +1,134 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate previews - small WebP/JPEG images, cached by what is on the certificate
+
+A preview is keyed by a SHA-256 of the certificate's details, the image
+format and the preview size. The key is also the preview's ETag. Since it
+is made from the details, the certificate is looked up in the store first
+(which may read it back from the spill directory); a browser that already
+has the preview is then answered with 304 without rendering or touching
+the preview cache. A preview is drawn from the details when first asked for,
+not when the certificate is issued. Encoded previews are kept in an LRU up to
+PREVIEW_CACHE_BYTES; requests for a preview that is already being rendered
+wait for that render instead of starting their own.
+"""
+
+import collections
+import concurrent.futures
+import hashlib
+import io
+import json
+import threading
+
+from PIL import Image, features
+
+from config import PREVIEW_CACHE_BYTES
+
+PREVIEW_SIZE = (600, 425)
+DETAIL_FIELDS = ('student_name', 'start_date', 'end_date', 'institution', 'course')
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 85, 'optimize': True}),
+}
+WEBP_SUPPORTED = features.check('webp')
+
+
+def preview_format(accept_mimetypes):
+    """'webp' when the client names it and Pillow can write it, otherwise 'jpeg'
+
+    Browsers list image/webp explicitly when fetching images; a bare */*
+    (curl, scripts) gets JPEG, which everything can open.
+    """
+    if WEBP_SUPPORTED and any(value == 'image/webp' and quality for value, quality in accept_mimetypes):
+        return 'webp'
+    return 'jpeg'
+
+
+def preview_key(details, fmt):
+    """Content hash of a preview: same details, format and size, same key"""
+    material = json.dumps([details.get(field, "") for field in DETAIL_FIELDS] + [fmt, PREVIEW_SIZE])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def encode_preview(img, fmt):
+    """Preview bytes from a full-size rendered certificate"""
+    img = img.convert('RGB')
+    # The preview is exactly half size: reducing_gap lets a box reduce do most of the work
+    img = img.resize(PREVIEW_SIZE, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    pil_format, _, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    img.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+class PreviewCache:
+    """LRU of encoded previews by key, with one render per key at a time"""
+
+    def __init__(self, max_bytes=PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()  # key -> bytes, oldest use first
+        self.bytes = 0
+        self.rendering = {}  # key -> Future of the render in progress
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+    def get(self, key, render):
+        """Cached bytes for key, or render() them; concurrent misses share one render"""
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return data
+            future = self.rendering.get(key)
+            if future is None:
+                future = self.rendering[key] = concurrent.futures.Future()
+                self.misses += 1
+                leader = True
+            else:
+                self.joined += 1
+                leader = False
+        if not leader:
+            return future.result()
+
+        try:
+            data = render()
+        except Exception as e:
+            with self.lock:
+                del self.rendering[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            del self.rendering[key]
+            self._insert(key, data)
+        future.set_result(data)
+        return data
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'joined': self.joined}
+
+    def _insert(self, key, data):
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+        self.entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= len(old)
+
+
+_previews = None
+_previews_lock = threading.Lock()
+
+
+def get_previews():
+    """Shared PreviewCache for the running process"""
+    global _previews
+    with _previews_lock:
+        if _previews is None:
+            _previews = PreviewCache()
+    return _previews
@@ -0,0 +1,123 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate registry - every issued certificate on record, verifiable by id
+
+Issuing records the certificate in the certificates table:
+- a random id, under a unique index;
+- a SHA-256 digest of its details;
+- the details themselves.
+The digest is taken over a canonical encoding of the details, so anyone
+holding them can recompute it whatever renderer produced the image.
+Verification answers from an in-memory LRU in front of that index and
+never renders anything. Recently issued and recently verified
+certificates cost one dictionary lookup.
+
+The registry creates the academy tables (init_db) before its first
+database access, so the web app works under any server, not only when
+module11 is run as a script.
+"""
+
+import collections
+import hashlib
+import json
+import re
+import secrets
+import threading
+from datetime import datetime, timezone
+
+from config import VERIFY_CACHE_SIZE
+from db.database import get_certificate, init_db, save_certificate
+
+DETAIL_FIELDS = ('student_name', 'start_date', 'end_date', 'institution', 'course')
+ID_ATTEMPTS = 5  # 48 random bits per id; a second attempt is already vanishingly rare
+CERT_ID_RE = re.compile(r"^cert_\d{8}_[0-9a-f]{12}$")
+
+
+def certificate_digest(details):
+    """SHA-256 over the details as sorted-key, compact JSON"""
+    canonical = json.dumps({field: details.get(field, "") for field in DETAIL_FIELDS}, sort_keys=True,
+                           separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def new_certificate_id():
+    """Date of issue plus random hex: unique, and not guessable from a name"""
+    return f"cert_{datetime.now().strftime('%Y%m%d')}_{secrets.token_hex(6)}"
+
+
+class CertificateRegistry:
+    """Issues certificate ids and verifies them, with an LRU of records in front of the database"""
+
+    def __init__(self, cache_size=VERIFY_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache = collections.OrderedDict()  # cert_id -> record, oldest use first
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.initialised = False
+
+    def _init_db(self):
+        """Create the tables once per registry; init_db only adds what is missing"""
+        if not self.initialised:
+            with self.lock:
+                if not self.initialised:
+                    init_db()
+                    self.initialised = True
+
+    def issue(self, details):
+        """Record a certificate for details and return its new id
+
+        RuntimeError if every id tried was already taken; database errors are raised as they are.
+        """
+        digest = certificate_digest(details)
+        self._init_db()
+        for _ in range(ID_ATTEMPTS):
+            cert_id = new_certificate_id()
+            if save_certificate(cert_id, digest, *(details[field] for field in DETAIL_FIELDS)):
+                record = dict({field: details[field] for field in DETAIL_FIELDS}, cert_id=cert_id, digest=digest,
+                              issued_at=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'))
+                self._remember(cert_id, record)
+                return cert_id
+        raise RuntimeError(f"no free certificate id after {ID_ATTEMPTS} attempts")
+
+    def verify(self, cert_id):
+        """The record of an issued certificate, or None"""
+        if not CERT_ID_RE.match(cert_id):
+            return None  # Malformed ids never reach the database
+        with self.lock:
+            record = self.cache.get(cert_id)
+            if record is not None:
+                self.cache.move_to_end(cert_id)
+                self.hits += 1
+                return record
+            self.misses += 1
+        self._init_db()
+        record = get_certificate(cert_id)
+        if record is not None:
+            self._remember(cert_id, record)
+        return record
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.cache), 'max_entries': self.cache_size, 'hits': self.hits,
+                    'misses': self.misses}
+
+    def _remember(self, cert_id, record):
+        with self.lock:
+            self.cache[cert_id] = record
+            self.cache.move_to_end(cert_id)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Shared CertificateRegistry for the running process"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CertificateRegistry()
+    return _registry
@@ -0,0 +1,188 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate store - issued certificates' details, bounded by bytes and age
+
+One store per process, shared by every request thread. Only the details
+are kept: the PDF and the preview are both drawn from them when asked for,
+so nothing is rendered or encoded when a certificate is issued. Entries
+live in an LRU ordered dict up to CERTIFICATE_STORE_BYTES of their JSON
+encoding. The least recently used are evicted first. When
+CERTIFICATE_SPILL_DIR is set they are written there, so a download still
+finds them. Anything older than CERTIFICATE_TTL is gone from both places.
+"""
+
+import collections
+import heapq
+import json
+import os
+import re
+import threading
+import time
+
+from config import CERTIFICATE_STORE_BYTES, CERTIFICATE_TTL, CERTIFICATE_SPILL_DIR
+
+SWEEP_INTERVAL = 60  # Seconds between scans of the spill directory for expired files
+CERT_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")  # Ids become file names; nothing else is accepted
+
+
+class StoredCertificate:
+    __slots__ = ('cert_id', 'meta', 'size', 'expires_at')
+
+    def __init__(self, cert_id, meta, expires_at):
+        self.cert_id = cert_id
+        self.meta = meta
+        self.size = len(json.dumps(meta).encode())
+        self.expires_at = expires_at
+
+
+class CertificateStore:
+    """LRU + TTL store of certificate details with an in-memory byte budget"""
+
+    def __init__(self, max_bytes=CERTIFICATE_STORE_BYTES, ttl=CERTIFICATE_TTL, spill_dir=CERTIFICATE_SPILL_DIR,
+                 clock=time.time):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self.clock = clock
+        self.entries = collections.OrderedDict()  # cert_id -> StoredCertificate, oldest use first
+        # (expires_at, cert_id), soonest first. Entries reloaded from the spill directory come
+        # back with their old expiry, out of insertion order, hence a heap rather than a queue.
+        # Items for entries already gone are skipped when they reach the top.
+        self.expiry = []
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.last_sweep = clock()
+        self.evictions = 0
+        self.spills = 0
+
+    def put(self, cert_id, meta):
+        """Keep a certificate; meta is a JSON-serialisable dict (student_name, ...)"""
+        if not CERT_ID_RE.match(cert_id):
+            raise ValueError(f"invalid certificate id {cert_id!r}")
+        now = self.clock()
+        entry = StoredCertificate(cert_id, meta, now + self.ttl)
+        with self.lock:
+            evicted = self._insert(entry, now)
+        for old in evicted:
+            self._spill(old)
+        self._sweep_spilled(now)
+
+    def get(self, cert_id):
+        """meta of a live certificate, or None"""
+        if not CERT_ID_RE.match(cert_id):
+            return None
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(cert_id)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self.entries.move_to_end(cert_id)
+                    return entry.meta
+                self._remove(cert_id)
+                return None
+        entry = self._load_spilled(cert_id, now)
+        if entry is None:
+            return None
+        with self.lock:
+            # Used again: back into memory, and off the disk
+            evicted = [] if cert_id in self.entries else self._insert(entry, now)
+        self._delete_spilled(cert_id)
+        for old in evicted:
+            self._spill(old)
+        return entry.meta
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'evictions': self.evictions, 'spills': self.spills}
+
+    def _insert(self, entry, now):
+        """Add entry under the lock; returns the entries evicted to make room, for spilling"""
+        if entry.cert_id in self.entries:
+            self._remove(entry.cert_id)
+        self.entries[entry.cert_id] = entry
+        self.bytes += entry.size
+        heapq.heappush(self.expiry, (entry.expires_at, entry.cert_id))
+        # Expired entries go first, soonest expiry first until the first live one; then least
+        # recently used until back under budget
+        while self.expiry and self.expiry[0][0] <= now:
+            expires_at, cert_id = heapq.heappop(self.expiry)
+            old = self.entries.get(cert_id)
+            if old is not None and old.expires_at == expires_at:
+                self._remove(cert_id)
+        evicted = []
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.size
+            self.evictions += 1
+            evicted.append(old)
+        return evicted
+
+    def _remove(self, cert_id):
+        entry = self.entries.pop(cert_id)
+        self.bytes -= entry.size
+
+    def _path(self, cert_id):
+        return os.path.join(self.spill_dir, cert_id + ".json")
+
+    def _spill(self, entry):
+        if not self.spill_dir:
+            return
+        path = self._path(entry.cert_id)
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({'meta': entry.meta, 'expires_at': entry.expires_at}, f)
+            os.replace(path + ".tmp", path)
+            self.spills += 1
+        except OSError as e:
+            print(f"Error spilling certificate {entry.cert_id}: {e}")
+
+    def _load_spilled(self, cert_id, now):
+        if not self.spill_dir:
+            return None
+        try:
+            with open(self._path(cert_id), encoding="utf-8") as f:
+                record = json.load(f)
+            if record['expires_at'] <= now:
+                self._delete_spilled(cert_id)
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return StoredCertificate(cert_id, record['meta'], record['expires_at'])
+
+    def _delete_spilled(self, cert_id):
+        try:
+            os.remove(self._path(cert_id))
+        except OSError:
+            pass
+
+    def _sweep_spilled(self, now):
+        """Drop expired spill files; by file age, so no file needs opening"""
+        if not self.spill_dir or now - self.last_sweep < SWEEP_INTERVAL:
+            return
+        self.last_sweep = now
+        try:
+            names = os.listdir(self.spill_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if os.path.getmtime(path) + self.ttl <= now:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Shared CertificateStore for the running process"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CertificateStore()
+    return _store
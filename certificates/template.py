@@ -0,0 +1,133 @@
+"""
+DefenseShot: Elite Sniper Academy
+Certificate template - invariant layers rendered once, per-trainee text drawn per request
+
+Almost everything on a certificate is the same for every trainee: the
+seeded camouflage background, border, corners, headings, signature lines,
+seal and motto. CertificateTemplate draws all of that once per size and
+keeps the image; render() copies it and draws only the name, course,
+institution and dates.
+"""
+
+import random
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from certificates.fonts import get_registry
+
+WIDTH, HEIGHT = 1200, 850
+GOLD = '#FFD700'
+LIGHT_GREEN = '#90EE90'
+WHITE = '#FFFFFF'
+FACE = 'sans'
+TITLE_SIZE, SUBTITLE_SIZE, TEXT_SIZE, NAME_SIZE = 48, 24, 20, 36
+
+
+def military_background(width, height):
+    """Seeded camouflage pattern under a dark overlay; identical on every call"""
+    img = Image.new('RGB', (width, height), color='#1a1a1a')
+    draw = ImageDraw.Draw(img)
+
+    rng = random.Random(42)  # For consistent pattern
+    colors = ['#2d3e2d', '#3a4a3a', '#4a5a4a', '#1a2a1a']
+
+    # Add camouflage spots
+    for _ in range(200):
+        x = rng.randint(0, width)
+        y = rng.randint(0, height)
+        size = rng.randint(30, 100)
+        color = rng.choice(colors)
+        draw.ellipse([x, y, x + size, y + size], fill=color)
+
+    # Add subtle grid pattern
+    for i in range(0, width, 50):
+        draw.line([(i, 0), (i, height)], fill='#0a0a0a', width=1)
+    for i in range(0, height, 50):
+        draw.line([(0, i), (width, i)], fill='#0a0a0a', width=1)
+
+    # Apply blur for professional look
+    img = img.filter(ImageFilter.GaussianBlur(radius=1))
+
+    # Add overlay for reduced visibility
+    overlay = Image.new('RGBA', (width, height), color=(0, 0, 0, 180))
+    return Image.alpha_composite(img.convert('RGBA'), overlay)
+
+
+class CertificateTemplate:
+    """The military certificate at one size, with its static layers pre-rendered"""
+
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.width = width
+        self.height = height
+        self.fonts = get_registry()
+        self.base = self.render_static()
+
+    def centered(self, draw, y, text, fill, size):
+        width = self.fonts.text_width(FACE, size, text)
+        draw.text(((self.width - width) // 2, y), text, fill=fill, font=self.fonts.font(FACE, size))
+
+    def render_static(self):
+        """Background and every trainee-independent mark, as one RGBA image"""
+        width, height = self.width, self.height
+        img = military_background(width, height)
+        draw = ImageDraw.Draw(img)
+
+        # Border and corner decorations
+        for i in range(5):
+            draw.rectangle([10 + i, 10 + i, width - 10 - i, height - 10 - i], outline=GOLD, width=2)
+        corner_size = 50
+        for corner in [(20, 20), (width - 70, 20), (20, height - 70), (width - 70, height - 70)]:
+            draw.polygon([
+                corner,
+                (corner[0] + corner_size, corner[1]),
+                (corner[0] + corner_size // 2, corner[1] + corner_size // 2),
+                (corner[0], corner[1] + corner_size)
+            ], fill=GOLD)
+
+        # Headings and the lines around the variable text
+        self.centered(draw, 80, "🎯 DEFENSESHOT ELITE SNIPER ACADEMY 🎯", GOLD, TITLE_SIZE)
+        self.centered(draw, 140, "Certificate of Completion", LIGHT_GREEN, SUBTITLE_SIZE)
+        draw.line([(200, 180), (width - 200, 180)], fill=GOLD, width=3)
+        self.centered(draw, 220, "This is to certify that", WHITE, TEXT_SIZE)
+        draw.line([(200, 310), (width - 200, 310)], fill=GOLD, width=2)
+        self.centered(draw, 340, "has successfully completed the", WHITE, TEXT_SIZE)
+        draw.line([(150, 430), (width - 150, 430)], fill=LIGHT_GREEN, width=2)
+        self.centered(draw, 540, "In recognition of dedication, skill, and excellence", WHITE, TEXT_SIZE)
+
+        # Signature area
+        draw.text((150, 650), "Commanding Officer", fill=WHITE, font=self.fonts.font(FACE, TEXT_SIZE))
+        draw.line([(150, 680), (400, 680)], fill=GOLD, width=2)
+        draw.text((650, 650), "Date of Issue", fill=WHITE, font=self.fonts.font(FACE, TEXT_SIZE))
+        draw.line([(650, 680), (900, 680)], fill=GOLD, width=2)
+
+        # Academy seal (simplified) and motto
+        seal_center = (150, 750)
+        seal_radius = 40
+        draw.ellipse([seal_center[0] - seal_radius, seal_center[1] - seal_radius,
+                      seal_center[0] + seal_radius, seal_center[1] + seal_radius],
+                     outline=GOLD, width=3)
+        draw.text((seal_center[0] - 15, seal_center[1] - 10), "🎯", fill=GOLD, font=self.fonts.font(FACE, NAME_SIZE))
+        self.centered(draw, 780, "PRECISION • DISCIPLINE • EXCELLENCE", GOLD, TEXT_SIZE)
+        return img
+
+    def render(self, student_name, start_date, end_date, institution, course):
+        """A finished certificate: a copy of the static layers plus this trainee's details"""
+        img = self.base.copy()
+        draw = ImageDraw.Draw(img)
+        self.centered(draw, 260, student_name, GOLD, NAME_SIZE)
+        self.centered(draw, 380, course, LIGHT_GREEN, NAME_SIZE)
+        self.centered(draw, 460, f"at {institution}", WHITE, TEXT_SIZE)
+        self.centered(draw, 500, f"Course Period: {start_date} to {end_date}", WHITE, TEXT_SIZE)
+        draw.text((650, 690), end_date, fill=GOLD, font=self.fonts.font(FACE, TEXT_SIZE))
+        return img
+
+
+# Compiled once per size per process; Flask request threads share them read-only
+_templates = {}
+
+
+def get_template(width=WIDTH, height=HEIGHT):
+    template = _templates.get((width, height))
+    if template is None:
+        template = _templates[(width, height)] = CertificateTemplate(width, height)
+    return template
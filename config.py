@@ -39,6 +39,7 @@ QUIZ_PASS_SCORE = 8  # Score to unlock next module (out of 10)
 TOTAL_MODULES = 10
 QUIZ_QUESTIONS_PER_MODULE = 10
 QUIZ_TIME_LIMIT = 300  # 5 minutes per quiz
+QUESTION_TIME_LIMIT = 60  # Seconds per question; the quiz limit still applies
 
 # File Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -84,6 +85,32 @@ MODULE_TOPICS = {
     20: "Advanced Data Structures"
 }
 
+# PDF Reader Settings
+PDF_TILE_SIZE = 256  # Pixel edge of a rendered page tile
+PDF_TILE_CACHE_MB = 48  # Memory budget for cached tiles
+PDF_TILES_PER_FRAME = 4  # Tiles rasterized per frame, keeps panning at FPS
+PDF_ZOOM_LEVELS = (1.0, 1.5, 2.0, 3.0, 4.0)  # Multiples of the fit-to-screen scale
+PDF_FLIP_STEPS = 4  # Distinct scaled frames in the page-flip animation
+SEARCH_INDEX_PATH = os.path.join(USER_DATA_DIR, "search_index.db")
+THUMBNAIL_DIR = os.path.join(USER_DATA_DIR, "thumbnails")
+THUMBNAIL_WIDTH = 110  # Pixels; height follows the page aspect
+
+# Question Bank Settings
+COMPILED_BANK_DIR = os.path.join(USER_DATA_DIR, "question_banks")  # Binary banks built from MCQ_DIR
+QUIZ_JOURNAL_DIR = os.path.join(USER_DATA_DIR, "quiz_journals")  # In-progress quizzes, for resume
+JOURNAL_FSYNC_MS = 1000  # Longest a timer checkpoint waits for fsync; answers sync at once
+
+# Certificate Settings
+CERTIFICATE_STORE_BYTES = 64 * 1024 * 1024  # Issued certificates' details kept in memory, as JSON bytes
+CERTIFICATE_TTL = 24 * 3600  # Seconds a certificate stays downloadable
+CERTIFICATE_SPILL_DIR = os.path.join(USER_DATA_DIR, "certificates")  # Overflow from memory; None to disable
+PREVIEW_CACHE_BYTES = 16 * 1024 * 1024  # Encoded preview images kept in memory
+CERTIFICATE_WORKERS = os.cpu_count() or 2  # Renders running at once
+CERTIFICATE_QUEUE_LIMIT = 32  # Renders waiting for a worker before new ones get a 429
+JOB_TTL = 600  # Seconds a finished job can still be polled
+CERTIFICATE_BATCHES = 1  # Cohort ZIPs built at once; further /generate-batch requests get a 429
+VERIFY_CACHE_SIZE = 10000  # Certificate records kept in memory for /verify
+
 # Sound Settings
 SOUND_ENABLED = True
 SOUND_VOLUME = 0.7
@@ -75,6 +75,117 @@ def init_db():
         )
     ''')
 
+    # Per-page reading time, written once per reader session
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS page_dwell (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            module_number INTEGER,
+            document TEXT NOT NULL,
+            page_number INTEGER NOT NULL,
+            focused_ms INTEGER DEFAULT 0,
+            unfocused_ms INTEGER DEFAULT 0,
+            views INTEGER DEFAULT 0,
+            last_read TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, document, page_number)
+        )
+    ''')
+
+    # Adaptive quiz estimates: question difficulty and trainee ability (logit scale)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS question_ratings (
+            question_id TEXT PRIMARY KEY,
+            module_number INTEGER NOT NULL,
+            difficulty REAL NOT NULL,
+            answers INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_ratings_module ON question_ratings (module_number)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ability_ratings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            module_number INTEGER,
+            ability REAL NOT NULL,
+            answers INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, module_number)
+        )
+    ''')
+
+    # Spaced-repetition state per trainee and question (SM-2); times are Unix seconds
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_schedule (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            question_id TEXT NOT NULL,
+            module_number INTEGER NOT NULL,
+            repetitions INTEGER DEFAULT 0,
+            interval_days REAL DEFAULT 0,
+            ease REAL DEFAULT 2.5,
+            due_at REAL NOT NULL,
+            last_reviewed REAL,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, question_id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_review_due ON review_schedule (user_id, due_at)')
+
+    # Per-answer quiz telemetry, append-only; one batch per finished quiz
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS answer_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            quiz_id TEXT NOT NULL,
+            user_id INTEGER,
+            module_number INTEGER,
+            question_id TEXT NOT NULL,
+            sequence INTEGER NOT NULL,
+            chosen TEXT,
+            is_correct BOOLEAN,
+            first_choice_ms INTEGER,
+            response_ms INTEGER,
+            changes INTEGER DEFAULT 0,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_answer_events_question ON answer_events (question_id)')
+
+    # Streaming item-analysis accumulators, one row per question (see quiz.analysis)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_stats (
+            question_id TEXT PRIMARY KEY,
+            module_number INTEGER NOT NULL,
+            n INTEGER DEFAULT 0,
+            mean_x REAL DEFAULT 0,
+            mean_y REAL DEFAULT 0,
+            m2_x REAL DEFAULT 0,
+            m2_y REAL DEFAULT 0,
+            c_xy REAL DEFAULT 0,
+            option_counts TEXT DEFAULT '{}'
+        )
+    ''')
+
+    # Issued certificates, for verification (see certificates.registry)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS certificates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cert_id TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            student_name TEXT NOT NULL,
+            start_date TEXT,
+            end_date TEXT,
+            institution TEXT,
+            course TEXT,
+            issued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_certificates_cert_id ON certificates (cert_id)')
+
     # Initialize PDF records
     for i in range(1, TOTAL_MODULES + 1):
         cursor.execute('''
@@ -198,6 +309,284 @@ def update_progress(user_id, module_number, study_time):
         print(f"Error updating progress: {e}")
         return False
 
+def save_reading_session(user_id, page_rows):
+    """Add one reader session's per-page times to page_dwell and progress.study_time
+
+    page_rows holds (module_number, document, page_number, focused_ms,
+    unfocused_ms, views) tuples; everything is written in one transaction.
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT INTO page_dwell
+            (user_id, module_number, document, page_number, focused_ms, unfocused_ms, views)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, document, page_number) DO UPDATE SET
+                focused_ms = focused_ms + excluded.focused_ms,
+                unfocused_ms = unfocused_ms + excluded.unfocused_ms,
+                views = views + excluded.views,
+                last_read = CURRENT_TIMESTAMP
+        ''', [(user_id,) + tuple(row) for row in page_rows])
+
+        # Only focused time counts as study time (seconds, like the rest of progress)
+        module_ms = {}
+        for module_number, _, _, focused_ms, _, _ in page_rows:
+            if module_number:
+                module_ms[module_number] = module_ms.get(module_number, 0) + focused_ms
+        cursor.executemany('''
+            UPDATE progress
+            SET study_time = study_time + ?
+            WHERE user_id = ? AND module_number = ?
+        ''', [(round(ms / 1000), user_id, module_number) for module_number, ms in module_ms.items()])
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"Error saving reading session: {e}")
+        return False
+
+def get_page_dwell_report(module_number):
+    """Per-page reading totals for a module across all trainees, slowest pages first"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT document, page_number,
+                   COUNT(DISTINCT user_id) as readers,
+                   SUM(views) as views,
+                   SUM(focused_ms) as focused_ms,
+                   SUM(unfocused_ms) as unfocused_ms,
+                   SUM(focused_ms) / COUNT(DISTINCT user_id) as avg_focused_ms
+            FROM page_dwell
+            WHERE module_number = ?
+            GROUP BY document, page_number
+            ORDER BY avg_focused_ms DESC
+        ''', (module_number,))
+
+        pages = cursor.fetchall()
+        conn.close()
+
+        return [dict(page) for page in pages]
+
+    except Exception as e:
+        print(f"Error getting page dwell report: {e}")
+        return []
+
+def get_question_ratings(module_number):
+    """{question_id: (difficulty, answers)} for every rated question of a module"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT question_id, difficulty, answers FROM question_ratings
+            WHERE module_number = ?
+        ''', (module_number,))
+
+        ratings = {row['question_id']: (row['difficulty'], row['answers']) for row in cursor.fetchall()}
+        conn.close()
+        return ratings
+
+    except Exception as e:
+        print(f"Error getting question ratings: {e}")
+        return {}
+
+def get_ability(user_id, module_number):
+    """(ability, answers) for a trainee in a module, or None before their first quiz"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT ability, answers FROM ability_ratings
+            WHERE user_id = ? AND module_number = ?
+        ''', (user_id, module_number))
+
+        row = cursor.fetchone()
+        conn.close()
+        return (row['ability'], row['answers']) if row else None
+
+    except Exception as e:
+        print(f"Error getting ability: {e}")
+        return None
+
+def write_ratings(cursor, user_id, module_number, ability, answers, question_rows):
+    """The writes of save_ratings, inside the caller's transaction; errors are raised"""
+    cursor.executemany('''
+        INSERT INTO question_ratings (question_id, module_number, difficulty, answers)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (question_id) DO UPDATE SET
+            difficulty = difficulty + ?,
+            answers = answers + excluded.answers,
+            updated_at = CURRENT_TIMESTAMP
+    ''', [(question_id, module_number, start + delta, count, delta)
+          for question_id, start, delta, count in question_rows])
+
+    cursor.execute('''
+        INSERT INTO ability_ratings (user_id, module_number, ability, answers)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, module_number) DO UPDATE SET
+            ability = excluded.ability,
+            answers = excluded.answers,
+            updated_at = CURRENT_TIMESTAMP
+    ''', (user_id, module_number, ability, answers))
+
+def save_ratings(user_id, module_number, ability, answers, question_rows):
+    """Store a quiz's rating changes in one transaction
+
+    question_rows holds (question_id, starting_difficulty, delta, answers).
+    Deltas are added to the stored difficulty rather than overwriting it, so
+    kiosks finishing quizzes at the same time do not lose each other's updates.
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        write_ratings(cursor, user_id, module_number, ability, answers, question_rows)
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"Error saving ratings: {e}")
+        return False
+
+def get_review_states(user_id, question_ids):
+    """{question_id: (repetitions, interval_days, ease)} for questions already scheduled"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        placeholders = ", ".join("?" * len(question_ids))
+        cursor.execute(f'''
+            SELECT question_id, repetitions, interval_days, ease FROM review_schedule
+            WHERE user_id = ? AND question_id IN ({placeholders})
+        ''', (user_id, *question_ids))
+
+        states = {row['question_id']: (row['repetitions'], row['interval_days'], row['ease'])
+                  for row in cursor.fetchall()}
+        conn.close()
+        return states
+
+    except Exception as e:
+        print(f"Error getting review states: {e}")
+        return {}
+
+def write_review_states(cursor, rows):
+    """The writes of save_review_states, inside the caller's transaction; errors are raised"""
+    cursor.executemany('''
+        INSERT INTO review_schedule
+        (user_id, question_id, module_number, repetitions, interval_days, ease, due_at, last_reviewed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, question_id) DO UPDATE SET
+            module_number = excluded.module_number,
+            repetitions = excluded.repetitions,
+            interval_days = excluded.interval_days,
+            ease = excluded.ease,
+            due_at = excluded.due_at,
+            last_reviewed = excluded.last_reviewed
+    ''', rows)
+
+def save_review_states(rows):
+    """Write (user_id, question_id, module_number, repetitions, interval_days, ease,
+    due_at, last_reviewed) rows in one transaction"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        write_review_states(cursor, rows)
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"Error saving review schedule: {e}")
+        return False
+
+def get_due_reviews(user_id, module_numbers, now, limit):
+    """Questions due by now in the given modules, most overdue first
+
+    Reads the (user_id, due_at) index as a range, so the cost does not grow
+    with the trainee's answer history.
+    """
+    if not module_numbers:
+        return []
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        placeholders = ", ".join("?" * len(module_numbers))
+        cursor.execute(f'''
+            SELECT question_id, module_number, due_at FROM review_schedule
+            WHERE user_id = ? AND due_at <= ? AND module_number IN ({placeholders})
+            ORDER BY due_at
+            LIMIT ?
+        ''', (user_id, now, *module_numbers, limit))
+
+        reviews = cursor.fetchall()
+        conn.close()
+
+        return [dict(review) for review in reviews]
+
+    except Exception as e:
+        print(f"Error getting due reviews: {e}")
+        return []
+
+def count_due_reviews(user_id, module_numbers, now):
+    """Number of questions due by now in the given modules"""
+    if not module_numbers:
+        return 0
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        placeholders = ", ".join("?" * len(module_numbers))
+        cursor.execute(f'''
+            SELECT COUNT(*) as due FROM review_schedule
+            WHERE user_id = ? AND due_at <= ? AND module_number IN ({placeholders})
+        ''', (user_id, now, *module_numbers))
+
+        due = cursor.fetchone()['due']
+        conn.close()
+        return due
+
+    except Exception as e:
+        print(f"Error counting due reviews: {e}")
+        return 0
+
+def write_answer_events(cursor, rows):
+    """The writes of save_answer_events, inside the caller's transaction; errors are raised"""
+    cursor.executemany('''
+        INSERT INTO answer_events
+        (quiz_id, user_id, module_number, question_id, sequence, chosen, is_correct,
+         first_choice_ms, response_ms, changes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+def save_answer_events(rows):
+    """Append (quiz_id, user_id, module_number, question_id, sequence, chosen, is_correct,
+    first_choice_ms, response_ms, changes) rows in one transaction"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        write_answer_events(cursor, rows)
+
+        conn.commit()
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"Error saving answer events: {e}")
+        return False
+
 def save_quiz_result(user_id, module_number, score, total_questions, time_taken):
     """Save quiz result and unlock next module if passed"""
     try:
@@ -291,6 +680,75 @@ def get_user_stats(user_id):
         print(f"Error getting user stats: {e}")
         return None
 
+def get_graduates():
+    """Users who have completed every module, with the dates they joined and finished"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT u.id, u.username, DATE(u.created_at) as start_date,
+                   DATE(MAX(p.completion_date)) as end_date
+            FROM users u
+            JOIN progress p ON p.user_id = u.id
+            WHERE p.is_completed = 1
+            GROUP BY u.id
+            HAVING COUNT(*) >= ?
+            ORDER BY u.username
+        ''', (TOTAL_MODULES,))
+
+        graduates = cursor.fetchall()
+        conn.close()
+
+        return [dict(graduate) for graduate in graduates]
+
+    except Exception as e:
+        print(f"Error getting graduates: {e}")
+        return []
+
+def save_certificate(cert_id, digest, student_name, start_date, end_date, institution, course):
+    """Record an issued certificate; False if the id is already taken
+
+    Any other database error (no table, locked, disk full) is raised, so it
+    is not mistaken for an id collision.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO certificates (cert_id, digest, student_name, start_date, end_date, institution, course)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (cert_id, digest, student_name, start_date, end_date, institution, course))
+
+        conn.commit()
+        return True
+
+    except sqlite3.IntegrityError:
+        return False
+    finally:
+        conn.close()
+
+def get_certificate(cert_id):
+    """An issued certificate's record by id, or None"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT cert_id, digest, student_name, start_date, end_date, institution, course, issued_at
+            FROM certificates WHERE cert_id = ?
+        ''', (cert_id,))
+
+        certificate = cursor.fetchone()
+        conn.close()
+
+        return dict(certificate) if certificate else None
+
+    except Exception as e:
+        print(f"Error getting certificate: {e}")
+        return None
+
 def save_session(user_data):
     """Save user session to file"""
     try:
@@ -8,6 +8,8 @@ import subprocess
 import sys
 import os
 from gui.utils import Button, ModuleCard, ProgressBar, render_text
+from gui.review import ReviewQuiz
+from quiz.review import due_count
 from db.database import get_unlocked_modules, get_user_stats, load_session, clear_session
 from config import *
 
@@ -32,6 +34,8 @@ class Dashboard:
         # Load user progress
         self.modules = []
         self.user_stats = {}
+        self.reviews_due = 0
+        self.review = None
         self.load_user_data()
 
         self.setup_ui()
@@ -58,6 +62,7 @@ class Dashboard:
 
             # Get user stats
             self.user_stats = get_user_stats(user_id) or {}
+            self.reviews_due = due_count(user_id)
         else:
             # Guest mode - only first module unlocked
             for i in range(1, TOTAL_MODULES + 1):
@@ -85,6 +90,10 @@ class Dashboard:
             SCREEN_WIDTH - 240, 10, 100, 30,
             "STATS", self.font_small
         )
+        self.review_btn = Button(
+            SCREEN_WIDTH - 360, 10, 100, 30,
+            f"REVIEW ({self.reviews_due})", self.font_small
+        )
 
         # Module cards
         self.module_cards = []
@@ -119,6 +128,14 @@ class Dashboard:
 
     def handle_event(self, event):
         """Handle pygame events"""
+        if self.review:
+            if self.review.handle_event(event) == "done":
+                self.review = None
+                self.modules = []
+                self.load_user_data()
+                self.setup_ui()
+            return None
+
         if event.type == pygame.MOUSEBUTTONDOWN:
             # Check header buttons
             if self.logout_btn.is_clicked(event.pos):
@@ -129,6 +146,11 @@ class Dashboard:
                 self.show_stats = not self.show_stats
                 return None
 
+            if self.review_btn.is_clicked(event.pos):
+                self.review = ReviewQuiz(self.screen, self.user.get('id', 0),
+                                         self.font_large, self.font_medium, self.font_small)
+                return None
+
             # Check module cards
             for card in self.module_cards:
                 if card.is_clicked(event.pos):
@@ -138,6 +160,7 @@ class Dashboard:
             # Update button hover states
             self.logout_btn.update(event.pos)
             self.stats_btn.update(event.pos)
+            self.review_btn.update(event.pos)
 
             # Update card hover states
             for card in self.module_cards:
@@ -204,6 +227,10 @@ class Dashboard:
         # Footer
         self.render_footer()
 
+        # Review quiz covers the dashboard while it runs
+        if self.review:
+            self.review.render()
+
     def render_header(self):
         """Render header section"""
         # Title - FIXED: Use get() method for safe access
@@ -216,6 +243,7 @@ class Dashboard:
         # Buttons
         self.logout_btn.render(self.screen, RED)
         self.stats_btn.render(self.screen, MILITARY_GREEN)
+        self.review_btn.render(self.screen, ORANGE if self.reviews_due else GRAY)
 
     def render_progress(self):
         """Render progress section"""
@@ -0,0 +1,123 @@
+"""
+DefenseShot: Elite Sniper Academy
+Review quiz GUI - due spaced-repetition questions from all unlocked modules
+"""
+
+import pygame
+from gui.utils import render_text, wrap_text
+from quiz.review import build_review_quiz, schedule_reviews
+from config import *
+
+class ReviewQuiz:
+    """Full-screen review quiz shown over the dashboard"""
+    def __init__(self, screen, user_id, font_large, font_medium, font_small):
+        self.screen = screen
+        self.user_id = user_id
+        self.font_large = font_large
+        self.font_medium = font_medium
+        self.font_small = font_small
+
+        self.questions = build_review_quiz(user_id)
+        self.responses = []
+        self.current = 0
+        self.selected = None
+        self.show_result = False
+        self.finished = not self.questions
+        self.saved = False
+
+    @property
+    def score(self):
+        return sum(1 for _, correct in self.responses if correct)
+
+    def finish(self):
+        """Reschedule everything answered so far, once"""
+        if not self.saved:
+            schedule_reviews(self.user_id, self.responses)
+            self.saved = True
+        self.finished = True
+
+    def handle_event(self, event):
+        """Handle pygame events; returns "done" when the review is closed"""
+        if event.type != pygame.KEYDOWN:
+            return None
+
+        if event.key == pygame.K_ESCAPE:
+            # Answers given before leaving still count
+            self.finish()
+            return "done"
+
+        if self.finished:
+            if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                return "done"
+            return None
+
+        question = self.questions[self.current]
+        if not self.show_result:
+            if pygame.K_1 <= event.key <= pygame.K_9:
+                choice = event.key - pygame.K_1
+                if choice < len(question.options):
+                    self.selected = chr(ord("A") + choice)
+            elif event.key == pygame.K_RETURN and self.selected:
+                self.responses.append((question, question.is_correct(self.selected)))
+                self.show_result = True
+        elif event.key == pygame.K_SPACE:
+            self.current += 1
+            self.selected = None
+            self.show_result = False
+            if self.current >= len(self.questions):
+                self.finish()
+
+        return None
+
+    def render(self):
+        """Render review quiz"""
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay.set_alpha(230)
+        overlay.fill(BLACK)
+        self.screen.blit(overlay, (0, 0))
+
+        if self.finished:
+            self.render_summary()
+            return
+
+        question = self.questions[self.current]
+        render_text(self.screen, f"🔁 Review {self.current + 1}/{len(self.questions)}",
+                    self.font_large, ORANGE, 50, 40)
+        render_text(self.screen, f"Module {question.module_number}  |  {question.category}  |  {question.difficulty}",
+                    self.font_small, LIGHT_GRAY, 50, 90)
+
+        y_offset = 130
+        for line in wrap_text(question.prompt, self.font_medium, SCREEN_WIDTH - 100):
+            render_text(self.screen, line, self.font_medium, WHITE, 50, y_offset)
+            y_offset += 30
+
+        y_offset += 20
+        for i, option in enumerate(question.options):
+            color = YELLOW if self.selected == chr(ord("A") + i) else WHITE
+            render_text(self.screen, f"{i + 1}. {option}", self.font_medium, color, 70, y_offset)
+            y_offset += 40
+
+        y_offset += 20
+        if self.show_result:
+            if question.is_correct(self.selected):
+                render_text(self.screen, "Correct!", self.font_medium, GREEN, 50, y_offset)
+            else:
+                render_text(self.screen, f"Wrong! Correct answer: {question.answer}", self.font_medium, RED, 50, y_offset)
+            render_text(self.screen, "Press SPACE to continue", self.font_small, LIGHT_GRAY, 50, y_offset + 40)
+        else:
+            hint = "Press ENTER to submit answer" if self.selected else "Press 1-4 to select answer"
+            render_text(self.screen, hint, self.font_small, LIGHT_GRAY, 50, y_offset)
+
+    def render_summary(self):
+        """Render end-of-review summary"""
+        if self.responses:
+            title = f"Review complete: {self.score}/{len(self.responses)} correct"
+            detail = "Missed questions come back tomorrow; the rest are spaced further out."
+        else:
+            title = "Nothing due for review"
+            detail = "Questions you answer in module quizzes are scheduled here automatically."
+
+        render_text(self.screen, title, self.font_large, ORANGE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40, center=True)
+        render_text(self.screen, detail, self.font_medium, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10, center=True)
+        render_text(self.screen, "Press ENTER to return", self.font_small, LIGHT_GRAY,
+                    SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60, center=True)
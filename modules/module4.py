@@ -12,6 +12,23 @@ from datetime import datetime
 import fitz  # PyMuPDF
 import subprocess
 
+# Project root on the path so the shared packages import when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from reader.surfaces import FlipAnimation, PixmapSurface
+from reader.search import find_highlights
+from reader.navigator import PageNavigator
+from reader.search_panel import SearchPanel
+from reader.tiles import PageViewport
+from reader.dwell import DwellTracker
+from quiz.bank import get_bank
+from quiz.adaptive import AdaptiveQuiz
+from quiz.telemetry import AnswerTelemetry
+from quiz.journal import QuizJournal
+from quiz.completion import save_finished_quiz
+from quiz.timer import QuizTimer, format_countdown
+from db.database import init_db
+from config import STUDY_DIR
+
 
 # --- Database Setup and Functions ---
 def init_database():
@@ -591,27 +608,125 @@ class ScoreSystem:
 
 class PDFReader:
     def __init__(self, pdf_path):
+        self.pdf_path = pdf_path
         self.doc = fitz.open(pdf_path)
         self.total_pages = len(self.doc)
         self.current_page = 0
+        self.page_image = None
         self.page_surface = None
         self.page_timer = 0
         self.can_take_quiz = False
         self.flip_animation = 0
         self.scale = 1.0
+        self.viewport = PageViewport(self.doc, int(WIDTH * 0.8), int(HEIGHT * 0.8), (WIDTH // 2, HEIGHT // 2))
+        self.dragging = False
+        self.flip = FlipAnimation()
+        self.search = SearchPanel(font, font_small, WIDTH)
+        self.navigator = PageNavigator(self.doc, pdf_path, font, font_small, WIDTH, HEIGHT)
+        self.highlights = []
+        self.dwell = DwellTracker()
         self.load_current_page()
 
+    def open_document(self, pdf_path):
+        """Switch the reader to another study manual, closing the one it had open"""
+        doc = fitz.open(pdf_path)
+        self.navigator.shutdown()
+        self.viewport.set_document(doc)
+        self.doc.close()  # The viewport's old page went with set_document; thumbnails use their own copy
+        self.pdf_path = pdf_path
+        self.doc = doc
+        self.total_pages = len(self.doc)
+        self.current_page = 0
+        self.navigator = PageNavigator(self.doc, pdf_path, font, font_small, WIDTH, HEIGHT)
+
     def load_current_page(self):
         page = self.doc.load_page(self.current_page)
         rect = page.rect
         scale = min((WIDTH * 0.8) / rect.width, (HEIGHT * 0.8) / rect.height)
         matrix = fitz.Matrix(scale, scale)
         pix = page.get_pixmap(matrix=matrix)
-        mode = "RGB" if not pix.alpha else "RGBA"
-        self.page_surface = pygame.image.frombuffer(pix.samples, (pix.width, pix.height), mode)
+        # Zero-copy: the surface reads the pixmap's buffer, page_image keeps it alive
+        self.page_image = PixmapSurface(pix)
+        self.page_surface = self.page_image.surface
         self.page_timer = pygame.time.get_ticks()
         self.can_take_quiz = False
         self.flip_animation = 30
+        self.flip.start(self.page_surface)
+        self.viewport.set_page(self.current_page)
+        self.highlights = []
+        self.dwell.page_shown(self.pdf_path, self.current_page)
+
+    def jump_to_hit(self, hit):
+        """Show a search hit's page, switching manual if needed, and highlight the match"""
+        if os.path.basename(self.pdf_path) != hit['file_name']:
+            self.open_document(os.path.join(STUDY_DIR, hit['file_name']))
+        self.current_page = min(hit['page'], self.total_pages - 1)
+        self.load_current_page()
+        self.highlights = find_highlights(self.viewport.page, hit['query'])
+
+    def go_to_page(self, page_number):
+        """Jump straight to a page - a single render however far away it is"""
+        if page_number != self.current_page:
+            self.current_page = page_number
+            self.load_current_page()
+
+    def handle_event(self, event):
+        """Zoom with +/-/0 or the mouse wheel, pan by dragging, search with /, pages with T.
+        Returns True if consumed"""
+        if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED):
+            # Only time with the window focused counts as study time
+            self.dwell.set_focused(event.type == pygame.WINDOWFOCUSGAINED)
+            return False
+
+        if self.search.active:
+            result = self.search.handle_event(event)
+            if isinstance(result, dict):
+                self.jump_to_hit(result)
+            return bool(result)
+
+        if self.navigator.active:
+            result = self.navigator.handle_event(event)
+            if not isinstance(result, bool):
+                self.go_to_page(result)
+                return True
+            return result
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SLASH or (event.key == pygame.K_f and event.mod & pygame.KMOD_CTRL):
+                self.search.open()
+                return True
+            elif event.key == pygame.K_t:
+                self.navigator.open(self.current_page)
+                return True
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                self.viewport.zoom_in()
+                return True
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.viewport.zoom_out()
+                return True
+            elif event.key == pygame.K_0:
+                self.viewport.reset_zoom()
+                return True
+        elif event.type == pygame.MOUSEWHEEL:
+            if event.y > 0:
+                self.viewport.zoom_in(pygame.mouse.get_pos())
+            elif event.y < 0:
+                self.viewport.zoom_out(pygame.mouse.get_pos())
+            return True
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.dragging = self.viewport.is_zoomed() and self.viewport.rect.collidepoint(event.pos)
+            return self.dragging
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self.viewport.pan(*event.rel)
+            return True
+        return False
+
+    def end_session(self):
+        """Save this session's reading times and stop background work"""
+        self.dwell.flush(get_logged_in_user_id())
+        self.navigator.shutdown()
 
     def next_page(self):
         if self.current_page < self.total_pages - 1:
@@ -624,9 +739,10 @@ class PDFReader:
             self.load_current_page()
 
     def update(self):
+        self.search.update()
         if self.flip_animation > 0:
             self.flip_animation -= 1
-            self.scale = 1.0 + (self.flip_animation / 30.0) * 0.2
+            self.scale = self.flip.scale_at(self.flip_animation)
         if not self.can_take_quiz:
             if (pygame.time.get_ticks() - self.page_timer) / 1000 >= PAGE_DISPLAY_TIME:
                 self.can_take_quiz = True
@@ -635,9 +751,13 @@ class PDFReader:
         if not self.page_surface:
             return
 
-        scaled_w = int(self.page_surface.get_width() * self.scale)
-        scaled_h = int(self.page_surface.get_height() * self.scale)
-        rect = pygame.Rect((WIDTH - scaled_w) // 2, (HEIGHT - scaled_h) // 2, scaled_w, scaled_h)
+        zoomed = self.viewport.is_zoomed()
+        if zoomed:
+            rect = self.viewport.rect
+        else:
+            scaled_w = int(self.page_surface.get_width() * self.scale)
+            scaled_h = int(self.page_surface.get_height() * self.scale)
+            rect = pygame.Rect((WIDTH - scaled_w) // 2, (HEIGHT - scaled_h) // 2, scaled_w, scaled_h)
         notebook = rect.inflate(60, 80)
 
         pygame.draw.rect(surface, (240, 240, 220), notebook)
@@ -651,15 +771,45 @@ class PDFReader:
         pygame.draw.rect(surface, WHITE, rect)
         pygame.draw.rect(surface, DARK_GRAY, rect, 2)
 
-        if self.scale != 1.0:
-            scaled = pygame.transform.scale(self.page_surface, (scaled_w, scaled_h))
-            surface.blit(scaled, rect.topleft)
+        if zoomed:
+            # Only the tiles inside the viewport are rasterized
+            self.viewport.draw(surface)
+        elif self.scale != 1.0:
+            surface.blit(self.flip.frame_at(self.flip_animation), rect.topleft)
         else:
             surface.blit(self.page_surface, rect.topleft)
+        self.draw_highlights(surface, rect)
 
-        txt = font.render(f"Page {self.current_page + 1} of {self.total_pages}", True, DARK_GRAY)
+        page_label = f"Page {self.current_page + 1} of {self.total_pages}"
+        if zoomed:
+            page_label += f"  |  Zoom {int(self.viewport.zoom * 100)}%"
+        txt = font.render(page_label, True, DARK_GRAY)
         surface.blit(txt, (rect.centerx - txt.get_width() // 2, rect.bottom + 10))
         self.draw_timer(surface)
+        self.search.draw(surface)
+        self.navigator.draw(surface)
+
+    def draw_highlights(self, surface, rect):
+        """Shade search matches; highlights are in PDF page coordinates"""
+        if not self.highlights:
+            return
+        page_rect = self.viewport.page.rect
+        if self.viewport.is_zoomed():
+            scale = self.viewport.render_scale
+            origin_x = rect.left - self.viewport.pan_x
+            origin_y = rect.top - self.viewport.pan_y
+        else:
+            scale = self.page_surface.get_width() / page_rect.width * self.scale
+            origin_x, origin_y = rect.topleft
+
+        for match in self.highlights:
+            area = pygame.Rect(int(origin_x + (match.x0 - page_rect.x0) * scale),
+                               int(origin_y + (match.y0 - page_rect.y0) * scale),
+                               max(1, int(match.width * scale)), max(1, int(match.height * scale))).clip(rect)
+            if area.width and area.height:
+                shade = pygame.Surface(area.size, pygame.SRCALPHA)
+                shade.fill((255, 255, 0, 90))
+                surface.blit(shade, area.topleft)
 
     def draw_timer(self, surface):
         elapsed = (pygame.time.get_ticks() - self.page_timer) / 1000
@@ -679,89 +829,6 @@ class PDFReader:
             surface.blit(msg, (WIDTH - 230, 30))
 
 
-# --- Game Data ---
-questions = [
-    {
-        "question": "What was the primary cause of the First India-Pakistan War of 1947-48?",
-        "options": ["A. Economic disputes over trade routes", "B. Religious conflicts in Punjab", "C. Border skirmishes in Gujarat", "D. The Maharaja of J&K's indecision on joining India or Pakistan"],
-        "answer": "D",
-        "difficulty": "Easy",
-        "category": "Historical Context"
-    },
-    {
-        "question": "How was the Indian Military divided between India and Pakistan after the partition?",
-        "options": ["A. Equally between the two nations", "B. 3/4th to India, 1/4th to Pakistan", "C. 1/2 to India, 1/2 to Pakistan", "D. 2/3rd to India, 1/3rd to Pakistan"],
-        "answer": "D",
-        "difficulty": "Easy",
-        "category": "Military Division"
-    },
-    {
-        "question": "Which princely states required military intervention to be integrated into India after independence?",
-        "options": ["A. Mysore, Travancore, and Bhopal", "B. Gwalior, Baroda, and Indore", "C. Patiala, Jodhpur, and Bikaner", "D. Hyderabad, Jammu & Kashmir, and Junagadh"],
-        "answer": "D",
-        "difficulty": "Medium",
-        "category": "Princely States"
-    },
-    {
-        "question": "What was the outcome of the UN Security Council's Resolution 47 passed on 21 April 1948?",
-        "options": ["A. It was accepted by both India and Pakistan", "B. It led to an immediate ceasefire", "C. It was rejected by India", "D. It was rejected by Pakistan"],
-        "answer": "D",
-        "difficulty": "Medium",
-        "category": "International Diplomacy"
-    },
-    {
-        "question": "What was the key Pakistani strategy in Operation Gibraltar during the 1965 India-Pakistan War?",
-        "options": ["A. Launching a full-scale tank assault", "B. Conducting airstrikes on Indian cities", "C. Blocking Indian supply routes", "D. Sending soldiers disguised as Kashmiris to create panic"],
-        "answer": "D",
-        "difficulty": "Medium",
-        "category": "Military Strategy"
-    },
-    {
-        "question": "Which Indian military unit was involved in the historic link-up at Tangail during the 1971 India-Pakistan War?",
-        "options": ["A. 4 Grenadiers", "B. 163 Infantry Brigade", "C. 33 Corps", "D. 1 MARATHA LI and 2 PARA (MARATHA)"],
-        "answer": "D",
-        "difficulty": "Hard",
-        "category": "Military Operations"
-    },
-    {
-        "question": "What was the primary reason Pakistan launched Operation Badr during the Kargil War of 1999?",
-        "options": ["A. To capture Siachen Glacier", "B. To disrupt Indian trade routes", "C. To gain control of Srinagar", "D. To sever the link between Kashmir and Ladakh"],
-        "answer": "D",
-        "difficulty": "Hard",
-        "category": "Kargil War"
-    },
-    {
-        "question": "Why did India refrain from crossing the Line of Control (LOC) during the Kargil War?",
-        "options": ["A. Lack of military resources", "B. Pressure from the United States", "C. Fear of nuclear retaliation", "D. To avoid escalating the conflict and losing international support"],
-        "answer": "D",
-        "difficulty": "Hard",
-        "category": "Strategic Decisions"
-    },
-    {
-        "question": "What was a significant contributing factor to the India-China War of 1962?",
-        "options": ["A. China's opposition to India's nuclear program", "B. India's support for Mongolian independence", "C. Economic rivalry over Himalayan trade routes", "D. India's asylum to the Dalai Lama and border disputes"],
-        "answer": "D",
-        "difficulty": "Medium",
-        "category": "India-China Relations"
-    },
-    {
-        "question": "Which operation marked India's first and only amphibious landing during the 1971 India-Pakistan War?",
-        "options": ["A. Operation Vijay", "B. Operation Polo", "C. Operation Trident", "D. The landing at Cox's Bazar"],
-        "answer": "D",
-        "difficulty": "Hard",
-        "category": "Naval Operations"
-    }
-]
-
-
-
-
-
-
-
-
-
-
 # DFS for complete reconnaissance
 def deep_reconnaissance(graph, start_territory):
     visited = set()
@@ -1065,13 +1132,43 @@ def quiz_game():
 
     current_question = 0
     score = 0
-    quiz_questions = random.sample(questions, 10)  # Select 10 random questions
+    # Each question is picked to match the trainee's estimated ability
+    quiz = AdaptiveQuiz(get_bank().module(4), get_logged_in_user_id())
     selected_answer = None
     show_result = False
     result_timer = 0
-    start_time = pygame.time.get_ticks()
+    timed_out = False
     user_id = get_logged_in_user_id()
     quiz_completed = False
+    save_failed = False
+    # Answer times come from the quiz timer, so time spent paused is not counted
+    telemetry = AnswerTelemetry(user_id, 4, lambda: timer.elapsed_ms)
+    # A quiz cut off by a crash, reboot or closed window carries on where it stopped
+    journal = QuizJournal(user_id, 4)
+    quiz_questions = journal.resume(quiz, telemetry)
+    if quiz_questions:
+        current_question = len(quiz_questions) - 1
+        score = quiz.score
+        if len(quiz.responses) == len(quiz_questions):
+            # Cut off after the final answer; SPACE finishes as usual
+            selected_answer = journal.last_choice
+            show_result = True
+    else:
+        first_question = quiz.next_question()
+        if first_question is None:
+            # An empty question bank: there is no quiz to take, and no journal to keep
+            print("No quiz questions available for Module 4")
+            journal.complete()
+            return "menu"
+        quiz_questions = [first_question]
+        journal.question_asked(first_question)
+    # Counts down only while the window has focus; a resumed quiz keeps its used time
+    timer = QuizTimer(elapsed_ms=journal.elapsed_ms)
+    telemetry.question_shown(quiz_questions[-1])
+    if show_result:
+        timer.stop()
+    else:
+        timer.start_question()
 
     # Create Next Module button (initially hidden)
     next_module_button = Button(
@@ -1081,48 +1178,65 @@ def quiz_game():
     next_module_button.visible = False
 
     while True:
+        journal.tick(timer.elapsed_ms)
+        submit_answer = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return "exit"
+            elif event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED):
+                timer.set_focused(event.type == pygame.WINDOWFOCUSGAINED)
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return "menu"
-                elif event.key == pygame.K_1 and not show_result and not quiz_completed:
+                elif event.key == pygame.K_1 and not show_result and not quiz_completed and not timer.paused:
                     selected_answer = "A"
-                elif event.key == pygame.K_2 and not show_result and not quiz_completed:
+                    telemetry.option_selected(selected_answer)
+                elif event.key == pygame.K_2 and not show_result and not quiz_completed and not timer.paused:
                     selected_answer = "B"
-                elif event.key == pygame.K_3 and not show_result and not quiz_completed:
+                    telemetry.option_selected(selected_answer)
+                elif event.key == pygame.K_3 and not show_result and not quiz_completed and not timer.paused:
                     selected_answer = "C"
-                elif event.key == pygame.K_4 and not show_result and not quiz_completed:
+                    telemetry.option_selected(selected_answer)
+                elif event.key == pygame.K_4 and not show_result and not quiz_completed and not timer.paused:
                     selected_answer = "D"
-                elif event.key == pygame.K_RETURN and selected_answer and not show_result and not quiz_completed:
-                    # Check answer
-                    if selected_answer == quiz_questions[current_question]["answer"]:
-                        score += 1
-                    show_result = True
-                    result_timer = pygame.time.get_ticks()
+                    telemetry.option_selected(selected_answer)
+                elif event.key == pygame.K_RETURN and selected_answer and not show_result and not quiz_completed \
+                        and not timer.paused:
+                    submit_answer = True
                 elif event.key == pygame.K_SPACE and show_result and not quiz_completed:
                     # Next question
                     current_question += 1
-                    if current_question >= len(quiz_questions):
-                        # Quiz completed
-                        quiz_completed = True
-                        end_time = pygame.time.get_ticks()
-                        time_taken = (end_time - start_time) // 1000
-
-                        # Save results and update progress
-                        save_quiz_result(user_id, 1, score, len(quiz_questions), time_taken)
-                        update_progress(user_id, 1, score)
-
-                        # Show Next Module button if score >= 8
-                        if score >= 8:
-                            next_module_button.visible = True
-                            unlock_next_module(user_id, 1)
-
-                        progress_updated = True
+                    upcoming = None if quiz.is_decided() or timer.out_of_time else quiz.next_question()
+                    if upcoming is None:
+                        # Quiz completed, or the bank has no questions left
+                        timer.stop()
+                        time_taken = timer.time_taken
+
+                        # Result, progress, ratings, reviews and statistics are saved in one
+                        # transaction; the journal is dropped only once that has committed
+                        if save_finished_quiz(quiz, telemetry, score, len(quiz_questions), time_taken, quiz.passed,
+                                              'defense_training.db'):
+                            journal.complete()
+                            quiz_completed = True
+                            save_failed = False
+
+                            # Show Next Module button if the quiz was passed
+                            if quiz.passed:
+                                next_module_button.visible = True
+
+                            progress_updated = True
+                        else:
+                            # Nothing was written and the journal still holds the quiz; SPACE tries again
+                            current_question -= 1
+                            save_failed = True
                     else:
+                        quiz_questions.append(upcoming)
+                        journal.question_asked(upcoming)
+                        telemetry.question_shown(upcoming)
+                        timer.start_question()
                         selected_answer = None
                         show_result = False
+                        timed_out = False
 
             # Handle Next Module button click
             if next_module_button.handle_event(event):
@@ -1134,6 +1248,26 @@ def quiz_game():
                 else:
                     print("Failed to open Module 2")
 
+        # Out of time: the question is marked with whatever is selected, if anything
+        if not show_result and not quiz_completed and timer.expired():
+            submit_answer = True
+            timed_out = True
+
+        if submit_answer:
+            # Check answer
+            correct = selected_answer == quiz_questions[current_question].answer
+            if correct:
+                score += 1
+            quiz.record(correct)
+            telemetry.answer_submitted(correct)
+            journal.answered(telemetry.rows[-1])
+            timer.end_question()
+            if quiz.is_decided() or timer.out_of_time:
+                # time_taken stops at the final answer, not at SPACE
+                timer.stop()
+            show_result = True
+            result_timer = pygame.time.get_ticks()
+
         # Update button
         next_module_button.update()
 
@@ -1142,26 +1276,30 @@ def quiz_game():
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         screen.blit(overlay, (0, 0))
-        if not quiz_completed:
+        if not quiz_completed and timer.paused:
+            # The question stays hidden while its clock is stopped
+            paused_text = font_medium.render("⏸ Paused - click the window to continue", True, YELLOW)
+            screen.blit(paused_text, (WIDTH // 2 - paused_text.get_width() // 2, HEIGHT // 2))
+        elif not quiz_completed:
             # Draw current question
             question_data = quiz_questions[current_question]
 
             # Question number and category
-            q_num_text = font_medium.render(f"Question {current_question + 1}/{len(quiz_questions)}", True, YELLOW)
+            q_num_text = font_medium.render(f"Question {current_question + 1}/{quiz.max_questions}", True, YELLOW)
             screen.blit(q_num_text, (50, 50))
 
-            category_text = font.render(f"Category: {question_data['category']}", True, CYAN)
+            category_text = font.render(f"Category: {question_data.category}", True, CYAN)
             screen.blit(category_text, (50, 90))
 
-            difficulty_text = font.render(f"Difficulty: {question_data['difficulty']}", True, ORANGE)
+            difficulty_text = font.render(f"Difficulty: {question_data.difficulty}", True, ORANGE)
             screen.blit(difficulty_text, (50, 120))
 
             # Question text
-            question_text = font_medium.render(question_data["question"], True, WHITE)
+            question_text = font_medium.render(question_data.prompt, True, WHITE)
             screen.blit(question_text, (50, 180))
 
             # Options
-            for i, option in enumerate(question_data["options"]):
+            for i, option in enumerate(question_data.options):
                 color = WHITE
                 if selected_answer == chr(65 + i):  # A, B, C, D
                     color = YELLOW
@@ -1171,15 +1309,20 @@ def quiz_game():
 
             # Show result if answer was selected
             if show_result:
-                correct_answer = question_data["answer"]
+                correct_answer = question_data.answer
                 if selected_answer == correct_answer:
                     result_text = font_medium.render("✅ Correct!", True, GREEN)
+                elif timed_out:
+                    result_text = font_medium.render(f"⏰ Time's up! Correct answer: {correct_answer}", True, RED)
                 else:
                     result_text = font_medium.render(f"❌ Wrong! Correct answer: {correct_answer}", True, RED)
 
                 screen.blit(result_text, (50, 400))
 
-                continue_text = font.render("Press SPACE to continue", True, WHITE)
+                if save_failed:
+                    continue_text = font.render("Could not save your result - press SPACE to try again", True, RED)
+                else:
+                    continue_text = font.render("Press SPACE to continue", True, WHITE)
                 screen.blit(continue_text, (50, 450))
             else:
                 # Instructions
@@ -1197,11 +1340,11 @@ def quiz_game():
             screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 100))
 
             # Score
-            score_text = big_font.render(f"Score: {score}/10", True, WHITE)
+            score_text = big_font.render(f"Score: {score}/{len(quiz_questions)}", True, WHITE)
             screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, 200))
 
             # Performance message
-            if score >= 8:
+            if quiz.passed:
                 performance_text = font_medium.render("🎉 Excellent! You can proceed to the next module!", True, GREEN)
                 next_module_button.visible = True
             elif score >= 6:
@@ -1223,12 +1366,25 @@ def quiz_game():
                                     WHITE)
         screen.blit(score_display, (WIDTH - 250, 50))
 
+        if not quiz_completed:
+            # Countdown HUD, red for the last 10 seconds
+            quiz_left = timer.quiz_remaining_ms()
+            quiz_time_text = font.render(f"Quiz time: {format_countdown(quiz_left)}", True,
+                                         RED if quiz_left <= 10000 else WHITE)
+            screen.blit(quiz_time_text, (WIDTH - 250, 90))
+            question_left = timer.question_remaining_ms()
+            if question_left is not None:
+                question_time_text = font.render(f"Question: {format_countdown(question_left)}", True,
+                                                 RED if question_left <= 10000 else WHITE)
+                screen.blit(question_time_text, (WIDTH - 250, 120))
+
         pygame.display.flip()
         clock.tick(60)
 
 
 def pdf_reader():
     """PDF reading function"""
+    reader = None
     try:
         pdf_path = r"C:\Users\B.PURNA\PycharmProjects\DefenseShot\study_materials\module_4.pdf"  # Make sure this file exists
         if not os.path.exists(pdf_path):
@@ -1257,6 +1413,8 @@ def pdf_reader():
 
         while True:
             for event in pygame.event.get():
+                if reader.handle_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     return "exit"
                 elif event.type == pygame.KEYDOWN:
@@ -1275,7 +1433,8 @@ def pdf_reader():
             reader.draw(screen)
 
             # Instructions
-            instruction_text = font.render("Use LEFT/RIGHT arrows to navigate, ESC to return", True, WHITE)
+            instruction_text = font.render("LEFT/RIGHT: turn page   +/-: zoom   drag: pan   /: search   T: all pages   "
+                                           "ESC: return", True, WHITE)
             screen.blit(instruction_text, (20, HEIGHT - 40))
 
             pygame.display.flip()
@@ -1284,6 +1443,9 @@ def pdf_reader():
     except Exception as e:
         print(f"Error in PDF reader: {e}")
         return "menu"
+    finally:
+        if reader is not None:
+            reader.end_session()
 
 
 def practice_range():
@@ -1391,6 +1553,7 @@ def main():
     # Initialize database and create default user
     init_database()
     create_default_user()
+    init_db()
 
     current_state = "menu"
 
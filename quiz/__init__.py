@@ -0,0 +1,4 @@
+"""
+DefenseShot: Elite Sniper Academy
+Quiz package - question banks and quiz logic shared by the module quizzes
+"""
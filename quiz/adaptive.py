@@ -0,0 +1,178 @@
+"""
+DefenseShot: Elite Sniper Academy
+Adaptive question selection - Elo-style ability and difficulty estimates
+
+Ability and difficulty share one logit scale: a trainee of ability a answers
+a question of difficulty d correctly with probability 1 / (1 + e^(d - a)).
+After every answer both estimates move by K * (outcome - expected), with K
+shrinking as an estimate collects answers. The next question is the unasked
+one whose difficulty is closest to the current ability - where an answer
+tells us the most - found by bisecting a difficulty-sorted index.
+"""
+
+import bisect
+import math
+
+from db.database import get_ability, get_question_ratings, save_ratings
+from config import QUIZ_PASS_SCORE, QUIZ_QUESTIONS_PER_MODULE
+
+DIFFICULTY_PRIORS = {"Easy": -1.0, "Medium": 0.0, "Hard": 1.0, "Expert": 1.5}
+K_START = 0.8  # Step size for a brand-new estimate
+K_MIN = 0.1  # Floor so estimates keep tracking slow drift
+
+
+def p_correct(ability, difficulty):
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+def k_factor(answers):
+    return max(K_MIN, K_START / math.sqrt(1 + answers))
+
+
+class ItemIndex:
+    """A module's questions sorted by estimated difficulty"""
+
+    def __init__(self, module_bank, ratings):
+        self.module_bank = module_bank
+        self.difficulty = {}
+        self.answers = {}
+        for label, positions in module_bank.by_difficulty.items():
+            prior = DIFFICULTY_PRIORS.get(label, 0.0)
+            for position in positions:
+                self.difficulty[position] = prior
+                self.answers[position] = 0
+        for question_id, (difficulty, answers) in ratings.items():
+            position = module_bank.by_id.get(question_id)
+            if position is not None:
+                self.difficulty[position] = difficulty
+                self.answers[position] = answers
+        self.keys = sorted((difficulty, position) for position, difficulty in self.difficulty.items())
+
+    def nearest(self, ability, exclude):
+        """Position of the unasked question whose difficulty is closest to ability"""
+        right = bisect.bisect_left(self.keys, (ability, -1))
+        left = right - 1
+        while left >= 0 or right < len(self.keys):
+            take_left = right >= len(self.keys) or \
+                (left >= 0 and ability - self.keys[left][0] <= self.keys[right][0] - ability)
+            if take_left:
+                position = self.keys[left][1]
+                left -= 1
+            else:
+                position = self.keys[right][1]
+                right += 1
+            if position not in exclude:
+                return position
+        return None
+
+    def update(self, position, difficulty):
+        old = (self.difficulty[position], position)
+        del self.keys[bisect.bisect_left(self.keys, old)]
+        bisect.insort(self.keys, (difficulty, position))
+        self.difficulty[position] = difficulty
+        self.answers[position] += 1
+
+
+# Built once per module per process; later quizzes reuse and keep updating them
+_indexes = {}
+
+
+def item_index(module_bank, reload=False):
+    """The module's shared ItemIndex; reload=True rebuilds it from the stored ratings"""
+    index = _indexes.get(module_bank.module_number)
+    if reload or index is None or index.module_bank is not module_bank:
+        index = ItemIndex(module_bank, get_question_ratings(module_bank.module_number))
+        _indexes[module_bank.module_number] = index
+    return index
+
+
+class AdaptiveQuiz:
+    """One trainee's quiz: picks each question and ends once pass/fail is settled
+
+    The pass rule is unchanged - QUIZ_PASS_SCORE correct out of
+    QUIZ_QUESTIONS_PER_MODULE - but the quiz stops as soon as the remaining
+    questions can no longer change the result.
+    """
+
+    def __init__(self, module_bank, user_id, max_questions=QUIZ_QUESTIONS_PER_MODULE,
+                 pass_score=QUIZ_PASS_SCORE):
+        self.module_bank = module_bank
+        self.module_number = module_bank.module_number
+        self.user_id = user_id
+        self.index = item_index(module_bank)
+        self.max_questions = min(max_questions, len(module_bank))
+        self.pass_score = min(pass_score, self.max_questions)
+
+        saved = get_ability(user_id, self.module_number) if user_id is not None else None
+        self.ability, self.ability_answers = saved if saved else (0.0, 0)
+
+        self.asked = set()
+        self.current = None
+        self.current_question = None
+        self.responses = []  # (Question, correct) in the order asked
+        self.score = 0
+        self.answered = 0
+        self.changes = {}  # position -> [starting difficulty, answers this quiz]
+
+    def reload_index(self):
+        """Start from the stored difficulties, dropping updates held only in this process"""
+        self.index = item_index(self.module_bank, reload=True)
+
+    def next_question(self):
+        """The most informative question not asked yet, or None when the bank is used up"""
+        position = self.index.nearest(self.ability, self.asked)
+        if position is None:
+            return None
+        self.asked.add(position)
+        self.current = position
+        self.current_question = self.module_bank.question(position)
+        return self.current_question
+
+    def take(self, question_id):
+        """Make a specific question the current one, e.g. when replaying a journal"""
+        position = self.module_bank.by_id.get(question_id)
+        if position is None or position in self.asked:
+            return None
+        self.asked.add(position)
+        self.current = position
+        self.current_question = self.module_bank.question(position)
+        return self.current_question
+
+    def record(self, correct):
+        """Update both estimates with the answer to the current question"""
+        position = self.current
+        difficulty = self.index.difficulty[position]
+        surprise = (1.0 if correct else 0.0) - p_correct(self.ability, difficulty)
+
+        self.ability += k_factor(self.ability_answers) * surprise
+        self.ability_answers += 1
+        self.changes.setdefault(position, [difficulty, 0])[1] += 1
+        self.index.update(position, difficulty - k_factor(self.index.answers[position]) * surprise)
+
+        self.responses.append((self.current_question, correct))
+        self.answered += 1
+        if correct:
+            self.score += 1
+
+    def is_decided(self):
+        remaining = self.max_questions - self.answered
+        return self.score >= self.pass_score or self.score + remaining < self.pass_score or remaining <= 0
+
+    @property
+    def passed(self):
+        return self.score >= self.pass_score
+
+    def question_rows(self):
+        """(question_id, starting_difficulty, delta, answers) for every question answered"""
+        question_rows = []
+        for position, (start, answers) in self.changes.items():
+            question_id = self.module_bank.question(position).id
+            question_rows.append((question_id, start, self.index.difficulty[position] - start, answers))
+        return question_rows
+
+    def save(self):
+        """Persist this quiz's rating changes in one write"""
+        if self.user_id is None or not self.changes:
+            return True
+        return save_ratings(self.user_id, self.module_number, self.ability, self.ability_answers,
+                            self.question_rows())
@@ -0,0 +1,249 @@
+"""
+DefenseShot: Elite Sniper Academy
+Item analysis - difficulty, discrimination and distractor use for every question
+
+Statistics are kept as streaming accumulators in item_stats, so each
+finished quiz updates only the questions it asked:
+
+    p-value          share of answers that were correct
+    point-biserial   correlation between getting the item right and the
+                     trainee's score on the rest of that quiz, from Welford
+                     running means and co-moments
+    option counts    how often each option was chosen
+
+Flag weak items across every bank:  python -m quiz.analysis
+Recompute from answer_events:       python -m quiz.analysis --rebuild
+"""
+
+import argparse
+import json
+import math
+import sys
+
+from db.database import get_db_connection
+from quiz.bank import get_bank
+
+MIN_ANSWERS = 20  # Items with fewer answers are never flagged
+TOO_EASY = 0.95
+TOO_HARD = 0.20
+MIN_DISCRIMINATION = 0.15
+MIN_DISTRACTOR_RATE = 0.05
+
+
+class ItemStats:
+    """Running statistics for one question"""
+
+    __slots__ = ('question_id', 'module_number', 'n', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy',
+                 'option_counts')
+
+    def __init__(self, question_id, module_number, n=0, mean_x=0.0, mean_y=0.0, m2_x=0.0, m2_y=0.0,
+                 c_xy=0.0, option_counts=None):
+        self.question_id = question_id
+        self.module_number = module_number
+        self.n = n
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.m2_x = m2_x
+        self.m2_y = m2_y
+        self.c_xy = c_xy
+        self.option_counts = option_counts or {}
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row['question_id'], row['module_number'], row['n'], row['mean_x'], row['mean_y'],
+                   row['m2_x'], row['m2_y'], row['c_xy'], json.loads(row['option_counts']))
+
+    def to_row(self):
+        return (self.question_id, self.module_number, self.n, self.mean_x, self.mean_y,
+                self.m2_x, self.m2_y, self.c_xy, json.dumps(self.option_counts, sort_keys=True))
+
+    def add(self, correct, rest_score, chosen):
+        """One answer: correct (bool), rest_score (0-1 on the other items), chosen letter"""
+        x = 1.0 if correct else 0.0
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = rest_score - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (rest_score - self.mean_y)
+        self.c_xy += dx * (rest_score - self.mean_y)
+        if chosen:
+            self.option_counts[chosen] = self.option_counts.get(chosen, 0) + 1
+
+    @property
+    def p_value(self):
+        return self.mean_x if self.n else None
+
+    @property
+    def point_biserial(self):
+        if self.m2_x <= 0 or self.m2_y <= 0:
+            return None
+        return self.c_xy / math.sqrt(self.m2_x * self.m2_y)
+
+    def option_rates(self):
+        total = sum(self.option_counts.values())
+        return {letter: count / total for letter, count in self.option_counts.items()} if total else {}
+
+
+def quiz_observations(rows):
+    """(question_id, module_number, correct, rest_score, chosen) for one quiz's answer rows
+
+    rows use the answer_events layout (see quiz.telemetry). A single-answer
+    quiz has no rest score, so it contributes nothing.
+    """
+    if len(rows) < 2:
+        return []
+    score = sum(1 for row in rows if row[6])
+    observations = []
+    for row in rows:
+        correct = bool(row[6])
+        rest_score = (score - correct) / (len(rows) - 1)
+        observations.append((row[3], row[2], correct, rest_score, row[5]))
+    return observations
+
+
+def _apply(conn, observations):
+    question_ids = sorted({observation[0] for observation in observations})
+    placeholders = ", ".join("?" * len(question_ids))
+    stats = {row['question_id']: ItemStats.from_row(row) for row in conn.execute(
+        f'SELECT * FROM item_stats WHERE question_id IN ({placeholders})', question_ids)}
+
+    for question_id, module_number, correct, rest_score, chosen in observations:
+        item = stats.get(question_id)
+        if item is None:
+            item = stats[question_id] = ItemStats(question_id, module_number)
+        item.add(correct, rest_score, chosen)
+
+    conn.executemany('''
+        INSERT OR REPLACE INTO item_stats
+        (question_id, module_number, n, mean_x, mean_y, m2_x, m2_y, c_xy, option_counts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [item.to_row() for item in stats.values()])
+
+
+def fold_quiz(conn, rows):
+    """Add one quiz's answer rows to item_stats on an open connection"""
+    observations = quiz_observations(rows)
+    if observations:
+        _apply(conn, observations)
+
+
+def update_item_stats(rows):
+    """Fold one finished quiz into item_stats - O(questions in the quiz)"""
+    observations = quiz_observations(list(rows))
+    if not observations:
+        return True
+    try:
+        conn = get_db_connection()
+        conn.isolation_level = None
+        # Read-modify-write: hold the write lock so two kiosks cannot interleave
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            _apply(conn, observations)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return True
+
+    except Exception as e:
+        print(f"Error updating item statistics: {e}")
+        return False
+
+
+def rebuild_item_stats():
+    """Recompute item_stats from the full answer_events history in one pass"""
+    conn = get_db_connection()
+    conn.execute('DELETE FROM item_stats')
+    cursor = conn.execute('''
+        SELECT quiz_id, user_id, module_number, question_id, sequence, chosen, is_correct,
+               first_choice_ms, response_ms, changes
+        FROM answer_events
+        ORDER BY quiz_id, sequence
+    ''')
+    quizzes = 0
+    rows = []
+    for row in cursor:
+        if rows and row['quiz_id'] != rows[-1][0]:
+            fold_quiz(conn, rows)
+            quizzes += 1
+            rows = []
+        rows.append(tuple(row))
+    if rows:
+        fold_quiz(conn, rows)
+        quizzes += 1
+    conn.commit()
+    conn.close()
+    return quizzes
+
+
+def item_flags(item, question):
+    """Reasons an item needs a look; empty when it is fine or has too few answers"""
+    if item.n < MIN_ANSWERS:
+        return []
+    flags = []
+    if item.p_value >= TOO_EASY:
+        flags.append(f"too easy (p={item.p_value:.2f})")
+    elif item.p_value <= TOO_HARD:
+        flags.append(f"too hard (p={item.p_value:.2f})")
+
+    r = item.point_biserial
+    if r is not None and r < 0:
+        flags.append(f"negative discrimination (r={r:.2f}) - check the answer key")
+    elif r is not None and r < MIN_DISCRIMINATION:
+        flags.append(f"weak discrimination (r={r:.2f})")
+
+    if question is not None:
+        rates = item.option_rates()
+        for i in range(len(question.options)):
+            letter = chr(ord("A") + i)
+            if letter == question.answer:
+                continue
+            rate = rates.get(letter, 0.0)
+            if rate < MIN_DISTRACTOR_RATE:
+                flags.append(f"distractor {letter} almost never chosen ({rate:.0%})")
+            elif rate > rates.get(question.answer, 0.0):
+                flags.append(f"distractor {letter} chosen more than the key ({rate:.0%})")
+    return flags
+
+
+def report():
+    """Print every flagged item, reading item_stats once"""
+    bank = get_bank()
+    conn = get_db_connection()
+    rows = conn.execute('SELECT * FROM item_stats ORDER BY module_number, question_id').fetchall()
+    conn.close()
+
+    flagged = 0
+    for row in rows:
+        item = ItemStats.from_row(row)
+        try:
+            question = bank.module(item.module_number).get(item.question_id)
+        except (ValueError, OSError):
+            question = None
+        flags = item_flags(item, question)
+        if not flags:
+            continue
+        flagged += 1
+        prompt = question.prompt if question else "(no longer in the bank)"
+        print(f"{item.question_id}  n={item.n}  {prompt[:70]}")
+        for flag in flags:
+            print(f"    - {flag}")
+    print(f"{flagged} of {len(rows)} analysed item(s) flagged (items with fewer than {MIN_ANSWERS} answers are skipped)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question quality report")
+    parser.add_argument("--rebuild", action="store_true", help="recompute statistics from answer_events first")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"Rebuilt item statistics from {rebuild_item_stats()} quiz(zes)")
+    report()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+DefenseShot: Elite Sniper Academy
+Question bank - per-module MCQ files in MCQ_DIR, loaded on first use
+
+Each module's questions live in MCQ_DIR/module_<N>.jsonl, one JSON object
+per line:
+
+    {"id": "m01-001", "question": "...", "options": ["A. ...", "B. ..."],
+     "answer": "B", "difficulty": "Easy", "category": "Strategy"}
+
+Adding a line adds a question; no code changes are needed. Files not
+named module_<N>.jsonl (e.g. art_of_war.jsonl for the standalone practice
+quiz) are not course modules and are opened with ModuleBank.from_file.
+
+Check every bank:  python -m quiz.bank
+"""
+
+import json
+import os
+import random
+import re
+import sys
+
+from config import MCQ_DIR
+
+BANK_RE = re.compile(r"module_(\d+)\.jsonl$")
+
+
+def bank_path(module_number, mcq_dir=MCQ_DIR):
+    return os.path.join(mcq_dir, f"module_{module_number}.jsonl")
+
+
+class Question:
+    """One multiple-choice question; answer is the letter of the correct option"""
+
+    __slots__ = ('id', 'module_number', 'prompt', 'options', 'answer', 'difficulty', 'category')
+
+    def __init__(self, question_id, module_number, prompt, options, answer, difficulty, category):
+        self.id = question_id
+        self.module_number = module_number
+        self.prompt = prompt
+        self.options = tuple(options)
+        self.answer = answer
+        # A bank repeats a handful of labels thousands of times; keep one copy of each
+        self.difficulty = sys.intern(difficulty)
+        self.category = sys.intern(category)
+
+    @classmethod
+    def from_record(cls, record, module_number):
+        """Build from one bank line, raising ValueError if it is incomplete"""
+        missing = [key for key in ('id', 'question', 'options', 'answer') if not record.get(key)]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        answer = record['answer'].strip().upper()
+        if not ("A" <= answer <= "Z" and ord(answer) - ord("A") < len(record['options'])):
+            raise ValueError(f"answer {record['answer']!r} does not name one of the options")
+        return cls(record['id'], module_number, record['question'], record['options'], answer,
+                   record.get('difficulty', "Medium"), record.get('category', "General"))
+
+    def to_record(self):
+        return {
+            'id': self.id,
+            'question': self.prompt,
+            'options': list(self.options),
+            'answer': self.answer,
+            'difficulty': self.difficulty,
+            'category': self.category
+        }
+
+    def is_correct(self, letter):
+        return letter == self.answer
+
+    def __repr__(self):
+        return f"Question({self.id!r}, {self.category!r}, {self.difficulty!r})"
+
+
+class ModuleBank:
+    """Questions of one module, indexed by category and by difficulty"""
+
+    def __init__(self, module_number, questions):
+        self.module_number = module_number
+        self.questions = questions
+        self.by_id = {}
+        self.by_category = {}
+        self.by_difficulty = {}
+        for position, question in enumerate(questions):
+            if question.id in self.by_id:
+                raise ValueError(f"duplicate question id {question.id!r} in module {module_number}")
+            self.by_id[question.id] = position
+            self.by_category.setdefault(question.category, []).append(position)
+            self.by_difficulty.setdefault(question.difficulty, []).append(position)
+
+    @classmethod
+    def load(cls, module_number, mcq_dir=MCQ_DIR):
+        return cls.from_file(bank_path(module_number, mcq_dir), module_number)
+
+    @classmethod
+    def from_file(cls, path, module_number):
+        """Parse any bank file, e.g. one that belongs to no course module"""
+        questions = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    questions.append(Question.from_record(json.loads(line), module_number))
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_number}: {e}") from None
+        return cls(module_number, questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def question(self, position):
+        return self.questions[position]
+
+    def get(self, question_id):
+        position = self.by_id.get(question_id)
+        return None if position is None else self.question(position)
+
+    def positions(self, category=None, difficulty=None):
+        """Index positions matching the filters, without touching other questions"""
+        if category is None and difficulty is None:
+            return range(len(self))
+        if category is None:
+            return self.by_difficulty.get(difficulty, [])
+        in_category = self.by_category.get(category, [])
+        if difficulty is None:
+            return in_category
+        wanted = set(self.by_difficulty.get(difficulty, []))
+        return [position for position in in_category if position in wanted]
+
+    def select(self, category=None, difficulty=None):
+        return [self.question(position) for position in self.positions(category, difficulty)]
+
+    def sample(self, k, category=None, difficulty=None, rng=random):
+        """Up to k distinct random questions matching the filters"""
+        positions = self.positions(category, difficulty)
+        chosen = rng.sample(positions, min(k, len(positions)))
+        return [self.question(position) for position in chosen]
+
+
+class QuestionBank:
+    """All module banks in MCQ_DIR, each opened the first time it is needed
+
+    Banks are served from their compiled, memory-mapped form (quiz.compiled),
+    which is rebuilt whenever the source file changes.
+    """
+
+    def __init__(self, mcq_dir=MCQ_DIR):
+        self.mcq_dir = mcq_dir
+        self.modules = {}
+
+    def module_numbers(self):
+        """Modules that have a bank file, found from file names alone"""
+        numbers = []
+        for name in os.listdir(self.mcq_dir):
+            match = BANK_RE.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def module(self, module_number):
+        bank = self.modules.get(module_number)
+        if bank is None:
+            from quiz.compiled import open_bank  # compiled.py builds on this module
+
+            try:
+                bank = open_bank(module_number, self.mcq_dir)
+            except OSError as e:
+                # e.g. a read-only install; parse the source directly instead
+                print(f"Error opening compiled bank for module {module_number}: {e}")
+                bank = ModuleBank.load(module_number, self.mcq_dir)
+            self.modules[module_number] = bank
+        return bank
+
+    def sample(self, module_number, k, category=None, difficulty=None, rng=random):
+        return self.module(module_number).sample(k, category, difficulty, rng)
+
+    def get(self, question_id):
+        """Look a question up by id in whichever module holds it"""
+        for module_number in self.module_numbers():
+            question = self.module(module_number).get(question_id)
+            if question is not None:
+                return question
+        return None
+
+
+_bank = None
+
+
+def get_bank():
+    """Shared QuestionBank for the running process"""
+    global _bank
+    if _bank is None:
+        _bank = QuestionBank()
+    return _bank
+
+
+def main():
+    bank = QuestionBank()
+    errors = 0
+    for module_number in bank.module_numbers():
+        try:
+            module = bank.module(module_number)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            errors += 1
+            continue
+        print(f"Module {module_number:>2}: {len(module):>5} questions")
+        for difficulty, positions in sorted(module.by_difficulty.items()):
+            print(f"    {difficulty:<12} {len(positions):>5}")
+        print(f"    {len(module.by_category)} categories: {', '.join(sorted(module.by_category))}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
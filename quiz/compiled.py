@@ -0,0 +1,222 @@
+"""
+DefenseShot: Elite Sniper Academy
+Compiled question banks - binary, memory-mapped copies of the MCQ_DIR sources
+
+Layout of a .qbank file (little-endian):
+
+    header   magic, version, module number, question count,
+             source size and mtime, string table offset
+    index    one fixed-width entry per question: record offset,
+             category id, difficulty id, answer index
+    strings  interned category and difficulty labels
+    records  per question: option count, then id, prompt and options
+             as length-prefixed UTF-8
+
+Opening a bank reads only the header and the string table; a question is
+decoded when it is actually asked, so starting a quiz costs O(questions
+sampled) however large the bank is.
+
+Compile every bank:  python -m quiz.compiled
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+from quiz.bank import ModuleBank, Question, bank_path
+from config import MCQ_DIR, COMPILED_BANK_DIR
+
+MAGIC = b"DSQB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQqI")
+ENTRY = struct.Struct("<IHBB")
+LENGTH = struct.Struct("<H")
+
+
+def compiled_path(module_number, compiled_dir=COMPILED_BANK_DIR):
+    return os.path.join(compiled_dir, f"module_{module_number}.qbank")
+
+
+def _pack_string(text):
+    data = text.encode("utf-8")
+    if len(data) > 0xFFFF:
+        raise ValueError(f"text longer than 64 KiB: {text[:40]!r}...")
+    return LENGTH.pack(len(data)) + data
+
+
+def compile_bank(module_number, mcq_dir=MCQ_DIR, compiled_dir=COMPILED_BANK_DIR):
+    """Compile MCQ_DIR/module_N.jsonl to a .qbank file and return its path"""
+    source = bank_path(module_number, mcq_dir)
+    stat = os.stat(source)
+    questions = ModuleBank.load(module_number, mcq_dir).questions
+
+    strings = {}
+    for question in questions:
+        strings.setdefault(question.category, len(strings))
+        strings.setdefault(question.difficulty, len(strings))
+    if len(strings) > 0xFFFF:
+        raise ValueError(f"module {module_number} has more than 65535 distinct labels")
+    string_table = LENGTH.pack(len(strings)) + b"".join(_pack_string(label) for label in strings)
+
+    strings_offset = HEADER.size + ENTRY.size * len(questions)
+    offset = strings_offset + len(string_table)
+    index = bytearray()
+    records = bytearray()
+    for question in questions:
+        answer_index = ord(question.answer) - ord("A")
+        index += ENTRY.pack(offset + len(records), strings[question.category],
+                            strings[question.difficulty], answer_index)
+        records.append(len(question.options))
+        for text in (question.id, question.prompt) + question.options:
+            records += _pack_string(text)
+
+    header = HEADER.pack(MAGIC, VERSION, module_number, len(questions),
+                         stat.st_size, stat.st_mtime_ns, strings_offset)
+
+    os.makedirs(compiled_dir, exist_ok=True)
+    path = compiled_path(module_number, compiled_dir)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(index)
+        f.write(string_table)
+        f.write(records)
+    os.replace(temp_path, path)
+    return path
+
+
+class CompiledBank(ModuleBank):
+    """ModuleBank backed by a memory-mapped .qbank file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, module_number, count, source_size, source_mtime_ns, strings_offset = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a version {VERSION} question bank")
+        self.module_number = module_number
+        self.count = count
+        self.source_size = source_size
+        self.source_mtime_ns = source_mtime_ns
+
+        self.labels = []
+        position = strings_offset
+        (label_count,) = LENGTH.unpack_from(self.data, position)
+        position += LENGTH.size
+        for _ in range(label_count):
+            label, position = self._read_string(position)
+            self.labels.append(sys.intern(label))
+
+        self._by_id = None
+        self._by_category = None
+        self._by_difficulty = None
+
+    def close(self):
+        self.data.close()
+
+    def is_current(self, source_path):
+        """True if the file was compiled from the source as it is now"""
+        stat = os.stat(source_path)
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+
+    def _read_string(self, position):
+        (length,) = LENGTH.unpack_from(self.data, position)
+        start = position + LENGTH.size
+        return self.data[start:start + length].decode("utf-8"), start + length
+
+    def _entry(self, position):
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        return ENTRY.unpack_from(self.data, HEADER.size + position * ENTRY.size)
+
+    def __len__(self):
+        return self.count
+
+    def question(self, position):
+        """Decode one question straight from the mapped file"""
+        offset, category, difficulty, answer_index = self._entry(position)
+        option_count = self.data[offset]
+        question_id, cursor = self._read_string(offset + 1)
+        prompt, cursor = self._read_string(cursor)
+        options = []
+        for _ in range(option_count):
+            option, cursor = self._read_string(cursor)
+            options.append(option)
+        return Question(question_id, self.module_number, prompt, options, chr(ord("A") + answer_index),
+                        self.labels[difficulty], self.labels[category])
+
+    @property
+    def questions(self):
+        return [self.question(position) for position in range(self.count)]
+
+    # Filters and id lookups are rare, so their indexes are built on first use
+    # from the fixed-width entries (and, for ids, the first string of each record)
+
+    def _build_label_indexes(self):
+        self._by_category = {}
+        self._by_difficulty = {}
+        entries = self.data[HEADER.size:HEADER.size + self.count * ENTRY.size]
+        for position, (_, category, difficulty, _) in enumerate(ENTRY.iter_unpack(entries)):
+            self._by_category.setdefault(self.labels[category], []).append(position)
+            self._by_difficulty.setdefault(self.labels[difficulty], []).append(position)
+
+    @property
+    def by_category(self):
+        if self._by_category is None:
+            self._build_label_indexes()
+        return self._by_category
+
+    @property
+    def by_difficulty(self):
+        if self._by_difficulty is None:
+            self._build_label_indexes()
+        return self._by_difficulty
+
+    @property
+    def by_id(self):
+        if self._by_id is None:
+            self._by_id = {}
+            for position in range(self.count):
+                question_id, _ = self._read_string(self._entry(position)[0] + 1)
+                self._by_id[question_id] = position
+        return self._by_id
+
+
+def open_bank(module_number, mcq_dir=MCQ_DIR, compiled_dir=COMPILED_BANK_DIR):
+    """Compiled bank for a module, recompiling it first if the source changed"""
+    source = bank_path(module_number, mcq_dir)
+    path = compiled_path(module_number, compiled_dir)
+    if os.path.exists(path):
+        try:
+            bank = CompiledBank(path)
+            if bank.is_current(source):
+                return bank
+            bank.close()
+        except (ValueError, struct.error) as e:
+            print(f"Error reading compiled bank {path}: {e}")
+    return CompiledBank(compile_bank(module_number, mcq_dir, compiled_dir))
+
+
+def main():
+    from quiz.bank import QuestionBank
+
+    for module_number in QuestionBank().module_numbers():
+        start = time.perf_counter()
+        try:
+            path = compile_bank(module_number)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Module {module_number:>2}: {os.path.getsize(path):>9} bytes in {elapsed:.1f} ms -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+DefenseShot: Elite Sniper Academy
+Quiz completion - everything a finished quiz writes, committed as one transaction
+
+A finished quiz updates:
+- the quiz result and the module progress, in the module's own database
+  (defense_training.db);
+- the rating changes, the review schedule, the answer events and the item
+  statistics, in the academy database.
+Both databases are written through one connection, with the module's
+database attached, so SQLite commits them together. Either every row
+lands or none does. The caller keeps its quiz journal until this returns
+True, so a failed save can be tried again, or resumed later, with nothing
+half-written.
+"""
+
+import time
+
+from db.database import get_db_connection, write_ratings, write_review_states, write_answer_events
+from quiz.analysis import fold_quiz
+from quiz.review import review_rows
+
+
+def _record_result(cursor, user_id, module_id, score, total_questions, time_taken, passed):
+    """The module's quiz_results and user_progress rows, as its save_quiz_result,
+    update_progress and unlock_next_module write them"""
+    cursor.execute('''
+        INSERT INTO results.quiz_results (user_id, module_id, score, total_questions, time_taken)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (user_id, module_id, score, total_questions, time_taken))
+
+    cursor.execute('''
+        SELECT id FROM results.user_progress WHERE user_id = ? AND module_id = ?
+    ''', (user_id, module_id))
+    if cursor.fetchone():
+        cursor.execute('''
+            UPDATE results.user_progress
+            SET score = ?, completed_at = CURRENT_TIMESTAMP
+            WHERE user_id = ? AND module_id = ?
+        ''', (score, user_id, module_id))
+    else:
+        cursor.execute('''
+            INSERT INTO results.user_progress (user_id, module_id, score, is_unlocked)
+            VALUES (?, ?, ?, 1)
+        ''', (user_id, module_id, score))
+
+    if not passed:
+        return
+    next_module_id = module_id + 1
+    cursor.execute('SELECT id FROM results.modules WHERE id = ?', (next_module_id,))
+    if cursor.fetchone():
+        cursor.execute('''
+            SELECT id FROM results.user_progress WHERE user_id = ? AND module_id = ?
+        ''', (user_id, next_module_id))
+        if cursor.fetchone():
+            cursor.execute('''
+                UPDATE results.user_progress
+                SET is_unlocked = 1
+                WHERE user_id = ? AND module_id = ?
+            ''', (user_id, next_module_id))
+        else:
+            cursor.execute('''
+                INSERT INTO results.user_progress (user_id, module_id, score, is_unlocked)
+                VALUES (?, ?, 0, 1)
+            ''', (user_id, next_module_id))
+
+
+def save_finished_quiz(quiz, telemetry, score, total_questions, time_taken, passed, results_db, now=None):
+    """Commit a finished quiz in one transaction; True once it is stored
+
+    results_db is the module's own database file. On failure nothing is
+    written and the telemetry keeps its rows, so calling again is safe.
+    """
+    rows = list(telemetry.rows)
+    reviews = review_rows(quiz.user_id, quiz.responses, time.time() if now is None else now) \
+        if quiz.user_id is not None else []
+    try:
+        conn = get_db_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute('ATTACH DATABASE ? AS results', (results_db,))
+            # Item statistics are read-modify-write: hold the write lock from the start
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = conn.cursor()
+                if quiz.user_id is not None and quiz.changes:
+                    write_ratings(cursor, quiz.user_id, quiz.module_number, quiz.ability, quiz.ability_answers,
+                                  quiz.question_rows())
+                write_review_states(cursor, reviews)
+                write_answer_events(cursor, rows)
+                fold_quiz(conn, rows)
+                _record_result(cursor, quiz.user_id, quiz.module_number, score, total_questions, time_taken,
+                               passed)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+    except Exception as e:
+        print(f"Error saving quiz: {e}")
+        return False
+
+    telemetry.rows.clear()
+    return True
@@ -0,0 +1,252 @@
+"""
+DefenseShot: Elite Sniper Academy
+Near-duplicate questions across module banks - MinHash signatures and LSH
+
+Each question is reduced to the set of word pairs in its normalised prompt
+and options (option order and "A." labels ignored). A 64-bin MinHash
+signature, built with one hash per word pair, estimates the Jaccard
+similarity of two such sets; splitting it into 16 bands of 4 and bucketing
+on each band puts similar questions in a shared bucket with high
+probability, so only bucket-mates are compared, and those by their exact
+similarity. Work grows linearly with the number of questions.
+
+Report:                  python -m quiz.dedup
+Write a deduplicated bank: python -m quiz.dedup --write DIR
+
+In a written bank each duplicate group keeps its question from the lowest
+module; groups whose answer keys disagree are left alone for a human.
+"""
+
+import argparse
+import array
+import json
+import os
+import re
+import sys
+
+from config import MCQ_DIR, QUIZ_QUESTIONS_PER_MODULE
+from quiz.bank import ModuleBank, QuestionBank, bank_path
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 similarity usually share a bucket
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7  # Jaccard similarity at which two questions count as duplicates
+MAX_BUCKET_GROUPS = 32  # Distinct groups per bucket a newcomer is compared with, most recent first
+DENSIFY_STEP = 0x9E3779B1  # Odd 32-bit constant separating values borrowed from one bin
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+LABEL_RE = re.compile(r"^\s*[A-Za-z][.)]\s+")
+
+
+def words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def shingles(question):
+    """Word pairs of the prompt and of each option, as one set"""
+    result = set()
+    parts = [question.prompt] + sorted(LABEL_RE.sub("", option) for option in question.options)
+    for part in parts:
+        tokens = words(part)
+        if len(tokens) == 1:
+            result.add(tokens[0])
+        result.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return result
+
+
+def answer_text(question):
+    return " ".join(words(LABEL_RE.sub("", question.options[ord(question.answer) - ord("A")])))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """One-permutation MinHash: each shingle is hashed once and kept in one of num_perm bins
+
+    Empty bins borrow the nearest filled bin to their right, offset by the
+    distance, so short questions still get a full signature. Python's string
+    hash is salted per process, which is fine: signatures are only compared
+    within one run and never stored.
+    """
+
+    def __init__(self, num_perm=NUM_PERM):
+        self.num_perm = num_perm
+
+    def signature(self, shingle_set):
+        """Packed as bytes: 4 per bin, compact and usable as a dict key when sliced"""
+        num_perm = self.num_perm
+        bins = [None] * num_perm
+        for shingle in shingle_set:
+            h = hash(shingle) & 0xFFFFFFFFFFFFFFFF
+            j = h % num_perm
+            value = (h // num_perm) & 0xFFFFFFFF
+            if bins[j] is None or value < bins[j]:
+                bins[j] = value
+
+        signature = bins[:]
+        nearest, distance = None, 0
+        for k in range(2 * num_perm - 1, -1, -1):
+            j = k % num_perm
+            if bins[j] is not None:
+                nearest, distance = bins[j], 0
+            else:
+                distance += 1
+                if k < num_perm:
+                    signature[j] = 0 if nearest is None else (nearest + distance * DENSIFY_STEP) & 0xFFFFFFFF
+        return array.array("I", signature).tobytes()
+
+
+class DuplicateGroup:
+    """Questions that are near-copies of one another; canonical is the one to keep"""
+
+    def __init__(self, questions, similarity):
+        self.questions = sorted(questions, key=lambda q: (q.module_number, q.id))
+        self.similarity = similarity  # question id -> similarity to the canonical question
+
+    @property
+    def canonical(self):
+        return self.questions[0]
+
+    @property
+    def duplicates(self):
+        return self.questions[1:]
+
+    @property
+    def answers_agree(self):
+        return len({answer_text(question) for question in self.questions}) == 1
+
+    @property
+    def cross_module(self):
+        return len({question.module_number for question in self.questions}) > 1
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_duplicates(questions, threshold=THRESHOLD):
+    """Group near-duplicate questions; returns DuplicateGroups, largest first"""
+    hasher = MinHasher()
+    # Only signatures are kept; the few candidate pairs re-derive their shingles. A question
+    # with no word pairs has nothing to compare, and its all-zero signature would put every
+    # such question in one bucket, so it gets none.
+    signatures = []
+    for question in questions:
+        shingle_set = shingles(question)
+        signatures.append(hasher.signature(shingle_set) if shingle_set else None)
+    parent = list(range(len(questions)))
+
+    for band in range(BANDS):
+        start, end = band * ROWS * 4, (band + 1) * ROWS * 4
+        buckets = {}  # band value -> one member of each group seen in the bucket, oldest first
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            members = buckets.setdefault(signature[start:end], [])
+            # Compare with a member of every distinct group already in the bucket, so two
+            # near-copies are found even when an unrelated collision got there first. The
+            # count is capped so a template-built bank with thousands of questions in one
+            # bucket stays linear.
+            compared = set()
+            matched = False
+            for j in reversed(members[-MAX_BUCKET_GROUPS:]):
+                root = _find(parent, j)
+                if root in compared:
+                    continue
+                compared.add(root)
+                if root != _find(parent, i) and \
+                        jaccard(shingles(questions[j]), shingles(questions[i])) >= threshold:
+                    parent[_find(parent, i)] = root
+                    matched = True
+            if not matched:
+                members.append(i)
+
+    members = {}
+    for i in range(len(questions)):
+        members.setdefault(_find(parent, i), []).append(i)
+
+    groups = []
+    for indexes in members.values():
+        if len(indexes) < 2:
+            continue
+        group = DuplicateGroup([questions[i] for i in indexes], {})
+        canonical = shingles(group.canonical)
+        for question in group.questions:
+            group.similarity[question.id] = jaccard(canonical, shingles(question))
+        groups.append(group)
+    groups.sort(key=lambda group: (-len(group.questions), group.canonical.module_number, group.canonical.id))
+    return groups
+
+
+def load_questions(mcq_dir=MCQ_DIR):
+    bank = QuestionBank(mcq_dir)
+    questions = []
+    for module_number in bank.module_numbers():
+        questions.extend(ModuleBank.load(module_number, mcq_dir).questions)
+    return questions
+
+
+def report(groups, total):
+    duplicates = sum(len(group.duplicates) for group in groups)
+    for group in groups:
+        note = "" if group.answers_agree else "  ANSWER KEYS DISAGREE"
+        print(f"{group.canonical.id}  {group.canonical.prompt[:70]}{note}")
+        for question in group.duplicates:
+            print(f"    {question.id}  similarity {group.similarity[question.id]:.2f}  {question.prompt[:60]}")
+    cross = sum(1 for group in groups if group.cross_module)
+    print(f"{len(groups)} duplicate group(s), {cross} spanning modules; "
+          f"{duplicates} of {total} question(s) are near-copies")
+
+
+def write_canonical(questions, groups, out_dir):
+    """Write every module bank to out_dir without the duplicates; returns module -> question count"""
+    dropped = set()
+    for group in groups:
+        if group.answers_agree:
+            dropped.update(question.id for question in group.duplicates)
+
+    os.makedirs(out_dir, exist_ok=True)
+    by_module = {}
+    for question in questions:
+        by_module.setdefault(question.module_number, [])
+        if question.id not in dropped:
+            by_module[question.module_number].append(question)
+    counts = {}
+    for module_number, kept in sorted(by_module.items()):
+        with open(bank_path(module_number, out_dir), "w", encoding="utf-8") as f:
+            for question in kept:
+                f.write(json.dumps(question.to_record()) + "\n")
+        counts[module_number] = len(kept)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions across module banks")
+    parser.add_argument("--mcq-dir", default=MCQ_DIR)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Jaccard similarity, 0-1")
+    parser.add_argument("--write", metavar="DIR", help="write deduplicated banks to DIR")
+    args = parser.parse_args()
+
+    questions = load_questions(args.mcq_dir)
+    groups = find_duplicates(questions, args.threshold)
+    report(groups, len(questions))
+
+    if args.write:
+        counts = write_canonical(questions, groups, args.write)
+        print(f"Wrote {sum(counts.values())} question(s) to {args.write}")
+        for module_number, count in counts.items():
+            if count < QUIZ_QUESTIONS_PER_MODULE:
+                print(f"    Warning: module {module_number} keeps only {count} question(s), "
+                      f"fewer than a quiz asks ({QUIZ_QUESTIONS_PER_MODULE})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+DefenseShot: Elite Sniper Academy
+Quiz journal - append-only record of a quiz in progress, for resuming after a crash
+
+One file per trainee and module in QUIZ_JOURNAL_DIR, one small JSON object
+per line:
+
+    {"quiz": id, "user": n, "module": n}          header
+    {"q": question_id}                            question shown
+    {"a": question_id, "c": "B", "ok": 1,         answer, with its telemetry
+     "f": first_choice_ms, "r": response_ms, "n": changes}
+    {"t": elapsed_ms}                             timer checkpoint
+
+Every line reaches the OS as soon as it is written, so killing the process
+loses nothing. Answers are fsynced immediately and timer checkpoints at most
+every JOURNAL_FSYNC_MS, which covers a power cut too. A torn last line from
+a crash mid-write is ignored. The file is removed once the finished quiz
+has been saved.
+"""
+
+import json
+import os
+import time
+
+from config import QUIZ_JOURNAL_DIR, JOURNAL_FSYNC_MS
+
+
+class QuizJournal:
+    """Journal for one trainee's quiz in one module"""
+
+    def __init__(self, user_id, module_number, journal_dir=QUIZ_JOURNAL_DIR):
+        self.user_id = user_id
+        self.module_number = module_number
+        self.path = os.path.join(journal_dir, f"user_{user_id}_module_{module_number}.jsonl")
+        self.file = None
+        self.last_sync = 0.0
+        self.last_tick = 0
+        self.elapsed_ms = 0
+        self.last_choice = None
+
+    def _write(self, record, sync=False):
+        if self.file is None:
+            return
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+        now = time.monotonic()
+        if sync or (now - self.last_sync) * 1000 >= JOURNAL_FSYNC_MS:
+            os.fsync(self.file.fileno())
+            self.last_sync = now
+
+    def _open(self, quiz_id, fresh):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, "w" if fresh else "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Error opening quiz journal: {e}")
+            self.file = None
+            return
+        if fresh:
+            self._write({'quiz': quiz_id, 'user': self.user_id, 'module': self.module_number}, sync=True)
+
+    def read(self):
+        """(quiz_id, asked ids, {id: answer record}, elapsed_ms), or None if there is nothing to resume"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except OSError:
+            return None
+
+        quiz_id, asked, answers, elapsed_ms = None, [], {}, 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Empty or torn line
+            if 'quiz' in record:
+                quiz_id = record['quiz']
+            elif 'q' in record:
+                asked.append(record['q'])
+            elif 'a' in record:
+                answers[record['a']] = record
+            elif 't' in record:
+                elapsed_ms = max(elapsed_ms, record['t'])
+        if quiz_id is None or not asked:
+            return None
+        return quiz_id, asked, answers, elapsed_ms
+
+    def resume(self, quiz, telemetry):
+        """Replay an interrupted quiz into quiz and telemetry
+
+        Returns the questions shown so far, the last one being the question
+        to show now (already answered if the quiz is over), or None when a
+        new journal was started instead.
+        """
+        state = self.read()
+        if state is not None:
+            quiz_id, asked, answers, elapsed_ms = state
+            if len(set(asked)) == len(asked) and all(question_id in quiz.module_bank.by_id for question_id in asked):
+                telemetry.quiz_id = quiz_id
+                # The replay re-applies this quiz's difficulty updates. If the quiz was left in this
+                # process, the cached index already holds them, so rebuild it from the database first
+                quiz.reload_index()
+                questions = []
+                for question_id in asked:
+                    questions.append(quiz.take(question_id))
+                    answer = answers.get(question_id)
+                    if answer is not None:
+                        quiz.record(bool(answer['ok']))
+                        telemetry.restore(question_id, answer['c'], bool(answer['ok']), answer['f'], answer['r'],
+                                          answer['n'])
+                        self.last_choice = answer['c']
+
+                self.elapsed_ms = elapsed_ms
+                self.last_tick = elapsed_ms
+                self._open(quiz_id, fresh=False)
+                if len(quiz.responses) == len(questions) and not quiz.is_decided():
+                    # Cut off between questions: carry on with a new one, if the bank has any left
+                    question = quiz.next_question()
+                    if question is not None:
+                        questions.append(question)
+                        self.question_asked(question)
+                return questions
+            # The bank changed under the journal; start over rather than guess
+            print(f"Quiz journal {self.path} no longer matches the question bank, starting a new quiz")
+
+        self._open(telemetry.quiz_id, fresh=True)
+        return None
+
+    def question_asked(self, question):
+        self._write({'q': question.id})
+
+    def answered(self, row):
+        """Journal an answer from its telemetry row (see quiz.telemetry)"""
+        self._write({'a': row[3], 'c': row[5], 'ok': int(bool(row[6])), 'f': row[7], 'r': row[8], 'n': row[9]},
+                    sync=True)
+
+    def tick(self, elapsed_ms):
+        """Checkpoint the quiz timer; called every frame, writes about once a second"""
+        if elapsed_ms - self.last_tick >= JOURNAL_FSYNC_MS:
+            self.last_tick = elapsed_ms
+            self._write({'t': elapsed_ms})
+
+    def complete(self):
+        """The quiz has been saved; the journal is no longer needed"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,87 @@
+"""
+DefenseShot: Elite Sniper Academy
+Spaced-repetition reviews - SM-2 scheduling of answered questions across modules
+
+Every answered question gets a review date. A correct answer pushes it out
+(1 day, 6 days, then interval x ease), a wrong one brings it back tomorrow
+and lowers its ease. A review quiz is whatever is due now, drawn from all
+of the trainee's unlocked modules.
+"""
+
+import time
+
+from db.database import (get_review_states, save_review_states, get_due_reviews, count_due_reviews,
+                         get_unlocked_modules)
+from quiz.bank import get_bank
+from config import QUIZ_QUESTIONS_PER_MODULE
+
+DAY = 86400
+START_EASE = 2.5
+MIN_EASE = 1.3
+QUALITY_CORRECT = 4  # SM-2 grades 0-5; a quiz only tells us right or wrong
+QUALITY_WRONG = 1
+
+
+def sm2(correct, repetitions, interval_days, ease):
+    """Next (repetitions, interval_days, ease) after one answer"""
+    quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+    if quality < 3:
+        repetitions = 0
+        interval_days = 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease, 1)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, interval_days, ease
+
+
+def schedule_reviews(user_id, responses, now=None):
+    """Reschedule every (Question, correct) pair from a quiz in one write"""
+    if user_id is None or not responses:
+        return True
+    return save_review_states(review_rows(user_id, responses, now))
+
+
+def review_rows(user_id, responses, now=None):
+    """review_schedule rows for every (Question, correct) pair from a quiz"""
+    now = time.time() if now is None else now
+    states = get_review_states(user_id, [question.id for question, _ in responses])
+
+    rows = []
+    for question, correct in responses:
+        repetitions, interval_days, ease = states.get(question.id, (0, 0, START_EASE))
+        repetitions, interval_days, ease = sm2(correct, repetitions, interval_days, ease)
+        rows.append((user_id, question.id, question.module_number, repetitions, interval_days, ease,
+                     now + interval_days * DAY, now))
+    return rows
+
+
+def unlocked_module_numbers(user_id):
+    return [module['module_number'] for module in get_unlocked_modules(user_id)]
+
+
+def due_count(user_id, now=None):
+    now = time.time() if now is None else now
+    return count_due_reviews(user_id, unlocked_module_numbers(user_id), now)
+
+
+def build_review_quiz(user_id, size=QUIZ_QUESTIONS_PER_MODULE, now=None, bank=None):
+    """Up to size due questions from all unlocked modules, most overdue first"""
+    now = time.time() if now is None else now
+    bank = get_bank() if bank is None else bank
+    questions = []
+    for review in get_due_reviews(user_id, unlocked_module_numbers(user_id), now, size):
+        try:
+            question = bank.module(review['module_number']).get(review['question_id'])
+        except (ValueError, OSError) as e:
+            print(f"Error loading review question {review['question_id']}: {e}")
+            continue
+        # Questions deleted from a bank simply stop coming back
+        if question is not None:
+            questions.append(question)
+    return questions
@@ -0,0 +1,74 @@
+"""
+DefenseShot: Elite Sniper Academy
+Answer telemetry - how each question was answered, kept in memory during a quiz
+
+Per question we keep the option chosen, whether it was right, time to the
+first selection, time to ENTER and how many times the selection changed.
+Rows sit in a fixed-size ring buffer while the quiz runs and are appended to
+answer_events in a single executemany when it ends, so the quiz loop never
+waits on the database.
+"""
+
+import collections
+import uuid
+
+from db.database import save_answer_events
+
+RING_CAPACITY = 256  # Answers held before the oldest are dropped; far above any quiz length
+
+
+class AnswerTelemetry:
+    """Collects one row per answered question; clock returns milliseconds"""
+
+    def __init__(self, user_id, module_number, clock, capacity=RING_CAPACITY):
+        self.quiz_id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.module_number = module_number
+        self.clock = clock
+        self.rows = collections.deque(maxlen=capacity)
+        self.sequence = 0
+        self.question_id = None
+        self.shown_at = None
+        self.first_choice_ms = None
+        self.choice = None
+        self.changes = 0
+
+    def question_shown(self, question):
+        self.question_id = question.id
+        self.shown_at = self.clock()
+        self.first_choice_ms = None
+        self.choice = None
+        self.changes = 0
+
+    def option_selected(self, letter):
+        if self.question_id is None:
+            return
+        if self.choice is None:
+            self.first_choice_ms = self.clock() - self.shown_at
+        elif letter != self.choice:
+            self.changes += 1
+        self.choice = letter
+
+    def answer_submitted(self, correct):
+        if self.question_id is None:
+            return
+        self.rows.append((self.quiz_id, self.user_id, self.module_number, self.question_id, self.sequence,
+                          self.choice, correct, self.first_choice_ms, self.clock() - self.shown_at,
+                          self.changes))
+        self.sequence += 1
+        self.question_id = None
+
+    def restore(self, question_id, chosen, correct, first_choice_ms, response_ms, changes):
+        """Re-add an answer recorded earlier, e.g. replayed from a quiz journal"""
+        self.rows.append((self.quiz_id, self.user_id, self.module_number, question_id, self.sequence,
+                          chosen, correct, first_choice_ms, response_ms, changes))
+        self.sequence += 1
+
+    def flush(self):
+        """Write the buffered answers in one batch; they are kept if the write fails"""
+        if not self.rows:
+            return True
+        if save_answer_events(list(self.rows)):
+            self.rows.clear()
+            return True
+        return False
@@ -0,0 +1,106 @@
+"""
+DefenseShot: Elite Sniper Academy
+Quiz timer - whole-quiz and per-question countdowns on a monotonic clock
+
+Time runs only while the quiz window has focus. Deadlines are fixed points
+on that active-time axis, so checking one is a single comparison: the frame
+rate, dropped frames or a wall-clock change cannot add or lose time, and
+time_taken is read from the same clock.
+"""
+
+import math
+import time
+
+from config import QUIZ_TIME_LIMIT, QUESTION_TIME_LIMIT
+
+
+def format_countdown(ms):
+    """m:ss, rounded up so 0:00 shows only once time has run out"""
+    seconds = math.ceil(max(0, ms) / 1000)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class QuizTimer:
+    """Active quiz time with a quiz deadline and one question deadline at a time
+
+    clock returns seconds; elapsed_ms lets a resumed quiz continue its clock.
+    """
+
+    def __init__(self, quiz_limit=QUIZ_TIME_LIMIT, question_limit=QUESTION_TIME_LIMIT, clock=time.monotonic,
+                 elapsed_ms=0):
+        self.clock = clock
+        self.quiz_deadline = quiz_limit * 1000
+        self.question_limit = question_limit * 1000
+        self.question_deadline = None
+        self.banked = elapsed_ms / 1000  # Active seconds before self.since
+        self.since = clock()  # None while paused or stopped
+        self.focused = True
+        self.stopped = False
+
+    @property
+    def elapsed_ms(self):
+        active = self.banked
+        if self.since is not None:
+            active += self.clock() - self.since
+        return int(active * 1000)
+
+    @property
+    def paused(self):
+        return not self.focused and not self.stopped
+
+    @property
+    def out_of_time(self):
+        return self.elapsed_ms >= self.quiz_deadline
+
+    @property
+    def time_taken(self):
+        """Whole seconds of active time, for quiz_results"""
+        return self.elapsed_ms // 1000
+
+    def _bank(self):
+        if self.since is not None:
+            now = self.clock()
+            self.banked += now - self.since
+            self.since = None
+
+    def set_focused(self, focused):
+        if focused == self.focused:
+            return
+        self.focused = focused
+        if focused:
+            if not self.stopped:
+                self.since = self.clock()
+        else:
+            self._bank()
+
+    def stop(self):
+        """Freeze the clock, e.g. once the final answer is in"""
+        self._bank()
+        self.stopped = True
+        self.question_deadline = None
+
+    def start_question(self):
+        """Schedule the current question's timeout; never later than the quiz's"""
+        self.question_deadline = min(self.elapsed_ms + self.question_limit, self.quiz_deadline)
+
+    def end_question(self):
+        self.question_deadline = None
+
+    def quiz_remaining_ms(self):
+        return max(0, self.quiz_deadline - self.elapsed_ms)
+
+    def question_remaining_ms(self):
+        if self.question_deadline is None:
+            return None
+        return max(0, self.question_deadline - self.elapsed_ms)
+
+    def expired(self):
+        """"quiz" or "question" once that deadline has passed, else None"""
+        if self.stopped:
+            return None
+        elapsed = self.elapsed_ms
+        if elapsed >= self.quiz_deadline:
+            return "quiz"
+        if self.question_deadline is not None and elapsed >= self.question_deadline:
+            return "question"
+        return None
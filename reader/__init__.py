@@ -0,0 +1,4 @@
+"""
+DefenseShot: Elite Sniper Academy
+Study reader package - PDF rendering helpers shared by the module readers
+"""
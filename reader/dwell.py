@@ -0,0 +1,67 @@
+"""
+DefenseShot: Elite Sniper Academy
+Reading analytics - per-page dwell time, kept in memory and saved once per session
+"""
+
+import os
+import time
+
+from db.database import save_reading_session
+from reader.search import MODULE_RE
+
+
+class DwellTracker:
+    """Accumulates how long each page was on screen, split by window focus
+
+    Work happens only on page changes and focus events, never per frame,
+    and nothing touches the database until flush().
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.stats = {}  # (module_number, document, page) -> [focused_s, unfocused_s, views]
+        self.current = None
+        self.focused = True
+        self.since = None
+
+    def page_shown(self, pdf_path, page_number):
+        """Start timing a page; closes the interval of the page before it"""
+        self._close_interval()
+        document = os.path.basename(pdf_path)
+        match = MODULE_RE.search(document)
+        key = (int(match.group(1)) if match else 0, document, page_number)
+        self.stats.setdefault(key, [0.0, 0.0, 0])[2] += 1
+        self.current = key
+        self.since = self.clock()
+
+    def set_focused(self, focused):
+        if focused != self.focused:
+            self._close_interval()
+            self.focused = focused
+
+    def stop(self):
+        """Close the open interval; nothing is timed until the next page_shown()"""
+        self._close_interval()
+        self.current = None
+
+    def _close_interval(self):
+        if self.current is None:
+            return
+        now = self.clock()
+        self.stats[self.current][0 if self.focused else 1] += now - self.since
+        self.since = now
+
+    def page_rows(self):
+        """(module_number, document, page, focused_ms, unfocused_ms, views) per page read"""
+        return [(module_number, document, page, int(focused * 1000), int(unfocused * 1000), views)
+                for (module_number, document, page), (focused, unfocused, views) in self.stats.items()]
+
+    def flush(self, user_id):
+        """Write the session in one transaction; keeps the data if the write fails"""
+        self.stop()
+        if not self.stats or user_id is None:
+            return True
+        if save_reading_session(user_id, self.page_rows()):
+            self.stats.clear()
+            return True
+        return False
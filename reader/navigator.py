@@ -0,0 +1,180 @@
+"""
+DefenseShot: Elite Sniper Academy
+Page navigator - thumbnail grid and PDF outline for jumping straight to a page
+"""
+
+import pygame
+
+from reader.thumbnails import ThumbnailLoader
+from config import THUMBNAIL_WIDTH, WHITE, YELLOW, GRAY, LIGHT_GRAY, DARK_GRAY
+
+OUTLINE_WIDTH = 280
+CELL_PADDING = 16
+LABEL_HEIGHT = 22
+
+
+class PageNavigator:
+    """Overlay listing every page as a thumbnail plus the outline (T to open)"""
+
+    def __init__(self, doc, pdf_path, font, small_font, screen_width, screen_height):
+        self.font = font
+        self.small_font = small_font
+        self.total_pages = len(doc)
+        self.toc = [entry for entry in doc.get_toc() if 1 <= entry[2] <= self.total_pages]
+        self.loader = ThumbnailLoader(pdf_path)
+        self.active = False
+        self.selected = 0
+        self.scroll_row = 0
+        self.page_input = ""
+
+        self.rect = pygame.Rect(40, 40, screen_width - 80, screen_height - 80)
+        outline_width = OUTLINE_WIDTH if self.toc else 0
+        self.outline_rect = pygame.Rect(self.rect.x + 10, self.rect.y + 50, outline_width, self.rect.height - 60)
+        self.grid_rect = pygame.Rect(self.outline_rect.right + 10, self.rect.y + 50,
+                                     self.rect.right - self.outline_rect.right - 20, self.rect.height - 60)
+
+        # Page 1's proportions size every cell, so layout never needs a render
+        first = doc.load_page(0).rect
+        self.thumb_height = int(THUMBNAIL_WIDTH * first.height / first.width)
+        self.cell_width = THUMBNAIL_WIDTH + CELL_PADDING
+        self.cell_height = self.thumb_height + LABEL_HEIGHT + CELL_PADDING
+        self.columns = max(1, self.grid_rect.width // self.cell_width)
+        self.visible_rows = max(1, self.grid_rect.height // self.cell_height)
+
+    def open(self, current_page):
+        self.active = True
+        self.selected = current_page
+        self.page_input = ""
+        self.scroll_to(self.selected)
+
+    def close(self):
+        self.active = False
+
+    def shutdown(self):
+        self.loader.close()
+
+    def scroll_to(self, page):
+        row = page // self.columns
+        if row < self.scroll_row:
+            self.scroll_row = row
+        elif row >= self.scroll_row + self.visible_rows:
+            self.scroll_row = row - self.visible_rows + 1
+
+    def scroll(self, rows):
+        last_row = (self.total_pages - 1) // self.columns
+        self.scroll_row = max(0, min(self.scroll_row + rows, max(0, last_row - self.visible_rows + 1)))
+
+    def visible_pages(self):
+        first = self.scroll_row * self.columns
+        last = min(self.total_pages, first + self.visible_rows * self.columns)
+        return range(first, last)
+
+    def select(self, page):
+        self.selected = max(0, min(self.total_pages - 1, page))
+        self.scroll_to(self.selected)
+
+    def cell_rect(self, page):
+        row = page // self.columns - self.scroll_row
+        col = page % self.columns
+        return pygame.Rect(self.grid_rect.x + col * self.cell_width, self.grid_rect.y + row * self.cell_height,
+                           self.cell_width, self.cell_height)
+
+    def outline_entry_at(self, pos):
+        if not self.outline_rect.collidepoint(pos):
+            return None
+        index = (pos[1] - self.outline_rect.y) // LABEL_HEIGHT
+        if 0 <= index < len(self.toc):
+            return self.toc[index]
+        return None
+
+    def handle_event(self, event):
+        """Returns a page number to jump to, True if the event was consumed, else False"""
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_ESCAPE, pygame.K_t):
+                self.close()
+            elif event.key == pygame.K_LEFT:
+                self.select(self.selected - 1)
+            elif event.key == pygame.K_RIGHT:
+                self.select(self.selected + 1)
+            elif event.key == pygame.K_UP:
+                self.select(self.selected - self.columns)
+            elif event.key == pygame.K_DOWN:
+                self.select(self.selected + self.columns)
+            elif event.key == pygame.K_PAGEUP:
+                self.select(self.selected - self.columns * self.visible_rows)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.select(self.selected + self.columns * self.visible_rows)
+            elif event.key == pygame.K_HOME:
+                self.select(0)
+            elif event.key == pygame.K_END:
+                self.select(self.total_pages - 1)
+            elif event.key == pygame.K_BACKSPACE:
+                self.page_input = self.page_input[:-1]
+            elif event.unicode.isdigit():
+                self.page_input = (self.page_input + event.unicode)[-4:]
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                page = int(self.page_input) - 1 if self.page_input else self.selected
+                self.close()
+                return max(0, min(self.total_pages - 1, page))
+            return True
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll(-event.y)
+            return True
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            entry = self.outline_entry_at(event.pos)
+            if entry is not None:
+                self.close()
+                return entry[2] - 1
+            for page in self.visible_pages():
+                if self.cell_rect(page).collidepoint(event.pos):
+                    self.close()
+                    return page
+            return True
+
+        return False
+
+    def draw(self, surface):
+        if not self.active:
+            return
+
+        overlay = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 225))
+        surface.blit(overlay, self.rect.topleft)
+        pygame.draw.rect(surface, YELLOW, self.rect, 2)
+
+        title = f"Go to page: {self.page_input}_" if self.page_input else \
+            f"Page {self.selected + 1} of {self.total_pages}  -  arrows to choose, type a number, ENTER to open"
+        surface.blit(self.font.render(title, True, WHITE), (self.rect.x + 15, self.rect.y + 12))
+
+        for i, (level, entry_title, page) in enumerate(self.toc):
+            y = self.outline_rect.y + i * LABEL_HEIGHT
+            if y + LABEL_HEIGHT > self.outline_rect.bottom:
+                break
+            label = self.small_font.render(f"{'  ' * (level - 1)}{entry_title}", True, LIGHT_GRAY)
+            surface.blit(label, (self.outline_rect.x, y), pygame.Rect(0, 0, self.outline_rect.width, LABEL_HEIGHT))
+
+        pages = self.visible_pages()
+        # Request one extra row so scrolling down usually finds thumbnails ready
+        prefetch_end = min(self.total_pages, pages.stop + self.columns)
+        self.loader.request(range(pages.start, prefetch_end))
+
+        for page in pages:
+            cell = self.cell_rect(page)
+            thumb_rect = pygame.Rect(cell.x + CELL_PADDING // 2, cell.y + CELL_PADDING // 2,
+                                     THUMBNAIL_WIDTH, self.thumb_height)
+            thumbnail = self.loader.get(page)
+            if thumbnail is not None:
+                surface.blit(thumbnail, thumb_rect.topleft)
+            else:
+                pygame.draw.rect(surface, DARK_GRAY, thumb_rect)
+            border = YELLOW if page == self.selected else GRAY
+            pygame.draw.rect(surface, border, thumb_rect, 3 if page == self.selected else 1)
+
+            label = self.small_font.render(str(page + 1), True, YELLOW if page == self.selected else WHITE)
+            surface.blit(label, (thumb_rect.centerx - label.get_width() // 2, thumb_rect.bottom + 2))
+
+        if self.toc:
+            pygame.draw.line(surface, GRAY, (self.outline_rect.right + 4, self.outline_rect.y),
+                             (self.outline_rect.right + 4, self.outline_rect.bottom))
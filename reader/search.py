@@ -0,0 +1,283 @@
+"""
+DefenseShot: Elite Sniper Academy
+Full-text search over the study PDFs - offline inverted index in SQLite
+
+Postings are stored per (term, document) as varint-encoded deltas of
+(page, word position), so a query is one primary-key range read per term.
+Documents are re-indexed only when their SHA-256 changes.
+
+Build or refresh the index:  python -m reader.search --build
+Query it from the shell:     python -m reader.search dijkstra shortest path
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import fitz  # PyMuPDF
+
+from config import STUDY_DIR, SEARCH_INDEX_PATH
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MODULE_RE = re.compile(r"module_(\d+)\.pdf$", re.IGNORECASE)
+PREFIX_EXPANSION_LIMIT = 32  # Terms a trailing partial word may expand to
+PHRASE_BONUS = 5
+
+
+def tokenize(text):
+    """Lowercase alphanumeric words, in reading order"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def encode_postings(postings):
+    """Varint-encode sorted (page, position) pairs as deltas"""
+    out = bytearray()
+    last_page, last_pos = 0, 0
+    for page, pos in postings:
+        page_delta = page - last_page
+        pos_delta = pos - last_pos if page_delta == 0 else pos
+        for value in (page_delta, pos_delta):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        last_page, last_pos = page, pos
+    return bytes(out)
+
+
+def decode_postings(data):
+    """Inverse of encode_postings"""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+
+    postings = []
+    page = pos = 0
+    for i in range(0, len(values), 2):
+        page_delta, pos_delta = values[i], values[i + 1]
+        if page_delta:
+            page += page_delta
+            pos = pos_delta
+        else:
+            pos += pos_delta
+        postings.append((page, pos))
+    return postings
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_highlights(page, query):
+    """Rectangles (page coordinates) to highlight for a query on one page"""
+    rects = page.search_for(query.strip())
+    if not rects:
+        for term in set(tokenize(query)):
+            rects.extend(page.search_for(term))
+    return rects
+
+
+class SearchIndex:
+    """Inverted index (term -> module, page, positions) for the study library"""
+
+    def __init__(self, index_path=SEARCH_INDEX_PATH, study_dir=STUDY_DIR):
+        self.index_path = index_path
+        self.study_dir = study_dir
+        self.conn = sqlite3.connect(index_path)
+        self.conn.row_factory = sqlite3.Row
+        self.init_schema()
+        self.documents = {}
+        self.load_documents()
+
+    def init_schema(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_name TEXT UNIQUE NOT NULL,
+                module_number INTEGER,
+                sha256 TEXT NOT NULL,
+                page_count INTEGER NOT NULL,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id)')
+        self.conn.commit()
+
+    def load_documents(self):
+        cursor = self.conn.execute('SELECT id, file_name, module_number, page_count FROM documents')
+        self.documents = {row['id']: dict(row) for row in cursor.fetchall()}
+
+    def close(self):
+        self.conn.close()
+
+    def update(self):
+        """Index new or changed PDFs and drop deleted ones. Returns counts"""
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+        existing = {row['file_name']: (row['id'], row['sha256'])
+                    for row in self.conn.execute('SELECT id, file_name, sha256 FROM documents')}
+
+        on_disk = sorted(name for name in os.listdir(self.study_dir) if name.lower().endswith(".pdf"))
+        for name in on_disk:
+            sha = file_sha256(os.path.join(self.study_dir, name))
+            known = existing.get(name)
+            if known and known[1] == sha:
+                stats['unchanged'] += 1
+                continue
+            self.index_document(name, sha, known[0] if known else None)
+            stats['indexed'] += 1
+
+        for name, (doc_id, _) in existing.items():
+            if name not in on_disk:
+                self.conn.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+                self.conn.execute('DELETE FROM documents WHERE id = ?', (doc_id,))
+                stats['removed'] += 1
+
+        self.conn.commit()
+        self.load_documents()
+        return stats
+
+    def index_document(self, file_name, sha, doc_id=None):
+        """Extract every page's words and (re)write the document's postings"""
+        postings = {}
+        with fitz.open(os.path.join(self.study_dir, file_name)) as doc:
+            page_count = len(doc)
+            for page_number in range(page_count):
+                words = tokenize(doc.load_page(page_number).get_text())
+                for position, term in enumerate(words):
+                    postings.setdefault(term, []).append((page_number, position))
+
+        match = MODULE_RE.search(file_name)
+        module_number = int(match.group(1)) if match else None
+        cursor = self.conn.cursor()
+        if doc_id is None:
+            cursor.execute('''
+                INSERT INTO documents (file_name, module_number, sha256, page_count)
+                VALUES (?, ?, ?, ?)
+            ''', (file_name, module_number, sha, page_count))
+            doc_id = cursor.lastrowid
+        else:
+            cursor.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+            cursor.execute('''
+                UPDATE documents
+                SET sha256 = ?, page_count = ?, module_number = ?, indexed_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (sha, page_count, module_number, doc_id))
+
+        cursor.executemany('INSERT INTO postings (term, doc_id, data) VALUES (?, ?, ?)',
+                           ((term, doc_id, encode_postings(entries)) for term, entries in postings.items()))
+
+    def term_postings(self, term, prefix=False):
+        """{(doc_id, page): [positions]} for a term, or every term it prefixes"""
+        if prefix:
+            rows = self.conn.execute('''
+                SELECT doc_id, data FROM postings
+                WHERE term >= ? AND term < ?
+                ORDER BY term LIMIT ?
+            ''', (term, term + "\uffff", PREFIX_EXPANSION_LIMIT * max(1, len(self.documents))))
+        else:
+            rows = self.conn.execute('SELECT doc_id, data FROM postings WHERE term = ?', (term,))
+
+        pages = {}
+        for doc_id, data in rows:
+            for page, pos in decode_postings(data):
+                pages.setdefault((doc_id, page), []).append(pos)
+        return pages
+
+    def search(self, query, limit=20):
+        """Pages containing every query word, best first
+
+        A trailing word without a following space matches as a prefix, so
+        results can be refreshed on every keystroke.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        prefix_last = not query[-1:].isspace()
+
+        per_term = []
+        for i, term in enumerate(terms):
+            pages = self.term_postings(term, prefix=prefix_last and i == len(terms) - 1)
+            if not pages:
+                return []
+            per_term.append(pages)
+
+        # Intersect on (document, page), rarest term first
+        per_term_sorted = sorted(per_term, key=len)
+        candidates = set(per_term_sorted[0])
+        for pages in per_term_sorted[1:]:
+            candidates &= pages.keys()
+
+        hits = []
+        for key in candidates:
+            score = sum(len(pages[key]) for pages in per_term)
+            if len(per_term) > 1:
+                following = set(per_term[0][key])
+                for pages in per_term[1:]:
+                    following = {pos + 1 for pos in following} & set(pages[key])
+                score += PHRASE_BONUS * len(following)
+
+            doc = self.documents.get(key[0])
+            if doc is None:
+                continue
+            hits.append({
+                'file_name': doc['file_name'],
+                'module_number': doc['module_number'],
+                'page': key[1],
+                'score': score
+            })
+
+        hits.sort(key=lambda hit: (-hit['score'], hit['module_number'] or 0, hit['page']))
+        return hits[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the study material search index")
+    parser.add_argument("query", nargs="*", help="words to search for")
+    parser.add_argument("--build", action="store_true", help="index new or changed PDFs first")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if args.build or not index.documents:
+        start = time.perf_counter()
+        stats = index.update()
+        print(f"Indexed {stats['indexed']}, unchanged {stats['unchanged']}, removed {stats['removed']} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    if args.query:
+        query = " ".join(args.query) + " "
+        start = time.perf_counter()
+        hits = index.search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        for hit in hits:
+            print(f"Module {hit['module_number']:>2}  page {hit['page'] + 1:>3}  score {hit['score']:>3}  "
+                  f"{hit['file_name']}")
+        print(f"{len(hits)} result(s) in {elapsed:.2f} ms")
+
+    index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+DefenseShot: Elite Sniper Academy
+In-reader search box - queries the study index as you type and jumps to a hit
+"""
+
+import threading
+
+import pygame
+
+from gui.utils import InputField
+from reader.search import SearchIndex
+from config import WHITE, YELLOW, GRAY, LIGHT_GRAY
+
+MAX_VISIBLE_RESULTS = 8
+ROW_HEIGHT = 28
+
+
+class SearchPanel:
+    """Search overlay for PDFReader, opened with '/' or Ctrl+F"""
+
+    def __init__(self, font, small_font, screen_width):
+        self.font = font
+        self.small_font = small_font
+        width = min(700, screen_width - 80)
+        height = 70 + MAX_VISIBLE_RESULTS * ROW_HEIGHT + 30
+        self.rect = pygame.Rect((screen_width - width) // 2, 20, width, height)
+        self.input = InputField(self.rect.x + 10, self.rect.y + 10, width - 20, 40,
+                                "Search all modules...", font)
+        self.active = False
+        self.index = None
+        self.indexing = False
+        self.index_ready = False
+        self.results = []
+        self.selected = 0
+        self.last_query = None
+        self.message = ""
+
+    def open(self):
+        self.active = True
+        self.input.active = True
+        if not self.index_ready and not self.indexing:
+            # Refresh changed PDFs off the render thread; the first build takes a second or two
+            self.indexing = True
+            self.message = "Indexing study materials..."
+            threading.Thread(target=self._build_index, daemon=True).start()
+
+    def close(self):
+        self.active = False
+        self.input.active = False
+
+    def _build_index(self):
+        try:
+            builder = SearchIndex()
+            builder.update()
+            builder.close()
+            self.message = ""
+            self.index_ready = True
+        except Exception as e:
+            print(f"Error building search index: {e}")
+            self.message = "Search index unavailable"
+        self.indexing = False
+
+    def update(self):
+        if not self.active:
+            return
+        self.input.update()
+        if self.index_ready and self.index is None:
+            # SQLite connections stay on the thread that opened them
+            self.index = SearchIndex()
+            self.refresh()
+
+    def refresh(self):
+        query = self.input.get_text()
+        if self.index is None or query == self.last_query:
+            return
+        self.last_query = query
+        self.results = self.index.search(query, limit=MAX_VISIBLE_RESULTS)
+        self.selected = 0
+        if query.strip() and not self.results:
+            self.message = "No matches"
+        else:
+            self.message = ""
+
+    def handle_event(self, event):
+        """Returns the chosen hit (a dict), True if the event was consumed, else False"""
+        if event.type != pygame.KEYDOWN:
+            return False
+
+        if event.key == pygame.K_ESCAPE:
+            self.close()
+        elif event.key == pygame.K_UP:
+            self.selected = max(0, self.selected - 1)
+        elif event.key == pygame.K_DOWN:
+            self.selected = min(len(self.results) - 1, self.selected + 1) if self.results else 0
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            if self.results:
+                hit = dict(self.results[self.selected])
+                hit['query'] = self.input.get_text()
+                self.close()
+                return hit
+        else:
+            self.input.handle_event(event)
+            self.refresh()
+        return True
+
+    def draw(self, surface):
+        if not self.active:
+            return
+
+        panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 220))
+        surface.blit(panel, self.rect.topleft)
+        pygame.draw.rect(surface, YELLOW, self.rect, 2)
+        self.input.render(surface)
+
+        top = self.rect.y + 60
+        for i, hit in enumerate(self.results):
+            row = pygame.Rect(self.rect.x + 10, top + i * ROW_HEIGHT, self.rect.width - 20, ROW_HEIGHT - 2)
+            if i == self.selected:
+                pygame.draw.rect(surface, GRAY, row)
+            label = f"Module {hit['module_number']}  -  Page {hit['page'] + 1}"
+            text = self.small_font.render(label, True, YELLOW if i == self.selected else WHITE)
+            surface.blit(text, (row.x + 8, row.y + 4))
+            matches = self.small_font.render(f"{hit['score']} match(es)", True, LIGHT_GRAY)
+            surface.blit(matches, (row.right - matches.get_width() - 8, row.y + 4))
+
+        footer = self.message or "UP/DOWN to choose, ENTER to open, ESC to close"
+        text = self.small_font.render(footer, True, LIGHT_GRAY)
+        surface.blit(text, (self.rect.x + 10, self.rect.bottom - 26))
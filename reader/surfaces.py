@@ -0,0 +1,80 @@
+"""
+DefenseShot: Elite Sniper Academy
+Pixmap to Surface conversion and cached page-flip animation frames
+"""
+
+import math
+
+import pygame
+
+from config import PDF_FLIP_STEPS
+
+
+class PixmapSurface:
+    """A pygame Surface that shares pixel memory with a PyMuPDF pixmap
+
+    frombuffer() on pix.samples_mv does not copy, so the surface is only
+    valid while the pixmap is alive. Holding both here ties their lifetimes.
+    """
+
+    __slots__ = ("pixmap", "surface")
+
+    def __init__(self, pixmap):
+        self.pixmap = pixmap
+        mode = "RGBA" if pixmap.alpha else "RGB"
+        self.surface = pygame.image.frombuffer(pixmap.samples_mv, (pixmap.width, pixmap.height), mode)
+
+    @property
+    def nbytes(self):
+        return self.pixmap.stride * self.pixmap.height
+
+
+class FlipAnimation:
+    """Zoom-out frames for the page flip, scaled once per step into reused buffers
+
+    The flip used to rescale the whole page on every one of its frames.
+    Here the animation is quantized to a few scale steps; each step is
+    scaled at most once per flip, into a buffer that survives across flips.
+    """
+
+    def __init__(self, duration=30, max_zoom=0.2, steps=PDF_FLIP_STEPS):
+        self.duration = duration
+        self.max_zoom = max_zoom
+        self.steps = steps
+        self.source = None
+        self.buffers = {}  # step -> full-size Surface, reused between flips
+        self.frames = {}  # step -> frame for the current source
+        self.allocated_bytes = 0
+
+    def start(self, source):
+        """Begin a flip onto a freshly loaded page surface"""
+        self.source = source
+        self.frames.clear()
+
+    def step_at(self, remaining):
+        """Quantized step for the number of animation frames remaining"""
+        if remaining <= 0:
+            return 0
+        return min(self.steps, math.ceil(remaining / self.duration * self.steps))
+
+    def scale_at(self, remaining):
+        return 1.0 + self.step_at(remaining) / self.steps * self.max_zoom
+
+    def frame_at(self, remaining):
+        """Scaled page for this point of the animation"""
+        step = self.step_at(remaining)
+        if step == 0 or self.source is None:
+            return self.source
+
+        frame = self.frames.get(step)
+        if frame is None:
+            scale = 1.0 + step / self.steps * self.max_zoom
+            size = (int(self.source.get_width() * scale), int(self.source.get_height() * scale))
+            buffer = self.buffers.get(step)
+            if buffer is None or buffer.get_width() < size[0] or buffer.get_height() < size[1]:
+                buffer = pygame.Surface(size, 0, self.source)
+                self.buffers[step] = buffer
+                self.allocated_bytes += buffer.get_bytesize() * size[0] * size[1]
+            frame = pygame.transform.scale(self.source, size, buffer.subsurface((0, 0) + size))
+            self.frames[step] = frame
+        return frame
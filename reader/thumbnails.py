@@ -0,0 +1,117 @@
+"""
+DefenseShot: Elite Sniper Academy
+Page thumbnails - rendered lazily on a background thread and cached on disk
+"""
+
+import hashlib
+import os
+import queue
+import threading
+
+import fitz  # PyMuPDF
+import pygame
+
+from config import THUMBNAIL_DIR, THUMBNAIL_WIDTH
+
+
+class ThumbnailLoader:
+    """Produces small page images for the navigator without blocking rendering
+
+    Only pages passed to request() are rendered, newest request first, and
+    a page that scrolled out of view before its turn is skipped. Each
+    thumbnail is written as PNG under THUMBNAIL_DIR so later sessions only
+    decode it; the file is written under a temporary name and renamed, so
+    a crash never leaves a truncated one behind. A page that cannot be
+    rendered is not tried again this session. PyMuPDF documents are not
+    shared across threads, so the worker opens its own copy of the PDF.
+    """
+
+    def __init__(self, pdf_path, cache_dir=THUMBNAIL_DIR, width=THUMBNAIL_WIDTH):
+        self.pdf_path = pdf_path
+        self.width = width
+        stat = os.stat(pdf_path)
+        key = f"{os.path.basename(pdf_path)}:{stat.st_size}:{int(stat.st_mtime)}:{width}"
+        self.cache_dir = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest()[:16])
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.requests = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.wanted = set()
+        self.pending = set()
+        self.failed = set()  # Pages that could not be rendered; not requested again
+        self.ready = {}  # page -> (width, height, rgb bytes), filled by the worker
+        self.surfaces = {}  # page -> Surface, built on the main thread
+        self.thread = None
+
+    def request(self, pages):
+        """Ask for thumbnails of the pages currently on screen"""
+        with self.lock:
+            self.wanted = set(pages)
+            for page in pages:
+                if page not in self.surfaces and page not in self.pending and page not in self.ready \
+                        and page not in self.failed:
+                    self.pending.add(page)
+                    self.requests.put(page)
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def get(self, page):
+        """Thumbnail Surface for a page, or None while it is still being made"""
+        surface = self.surfaces.get(page)
+        if surface is None and page in self.ready:
+            with self.lock:
+                width, height, samples = self.ready.pop(page)
+            surface = pygame.image.frombuffer(samples, (width, height), "RGB")
+            self.surfaces[page] = surface
+        return surface
+
+    def close(self):
+        """Stop the worker once it finishes the thumbnail in progress"""
+        if self.thread is not None:
+            self.requests.put(None)
+
+    def _run(self):
+        with fitz.open(self.pdf_path) as doc:
+            while True:
+                page = self.requests.get()
+                if page is None:
+                    return
+                with self.lock:
+                    if page not in self.wanted:
+                        # Scrolled away before we got to it; it will be re-requested if needed
+                        self.pending.discard(page)
+                        continue
+                try:
+                    pix = self._load_or_render(doc, page)
+                except Exception as e:
+                    print(f"Error rendering thumbnail for page {page + 1}: {e}")
+                    with self.lock:
+                        # request() runs every frame; without this the page would be retried 60 times a second
+                        self.pending.discard(page)
+                        self.failed.add(page)
+                    continue
+                with self.lock:
+                    self.ready[page] = (pix.width, pix.height, pix.samples)
+                    self.pending.discard(page)
+
+    def _load_or_render(self, doc, page_number):
+        path = os.path.join(self.cache_dir, f"{page_number}.png")
+        pix = None
+        if os.path.exists(path):
+            try:
+                pix = fitz.Pixmap(path)
+            except Exception as e:
+                # Unreadable (e.g. written by an older version without the rename); render it afresh
+                print(f"Discarding cached thumbnail {path}: {e}")
+                os.remove(path)
+        if pix is None:
+            page = doc.load_page(page_number)
+            scale = self.width / page.rect.width
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+            pix.save(path + ".tmp", output="png")
+            os.replace(path + ".tmp", path)
+        if pix.alpha or pix.n != 3:
+            pix = fitz.Pixmap(fitz.csRGB, pix, 0)
+        return pix
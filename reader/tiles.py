@@ -0,0 +1,229 @@
+"""
+DefenseShot: Elite Sniper Academy
+Tile-based page rendering - zoom and pan that only rasterize the visible area
+"""
+
+import math
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+import pygame
+
+from reader.surfaces import PixmapSurface
+from config import (PDF_TILE_SIZE, PDF_TILE_CACHE_MB, PDF_TILES_PER_FRAME,
+                    PDF_ZOOM_LEVELS, WHITE)
+
+
+class TileCache:
+    """LRU cache of rendered page tiles, bounded by a byte budget"""
+
+    def __init__(self, max_bytes=PDF_TILE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.tiles = OrderedDict()  # key -> (surface, nbytes, owner)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return a cached tile and mark it recently used, or None"""
+        entry = self.tiles.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.tiles.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, surface, owner=None):
+        """Store a tile, evicting least recently used tiles over budget
+
+        owner is whatever holds the surface's pixel memory (a pixmap for
+        zero-copy tiles); it is kept alive exactly as long as the tile.
+        """
+        nbytes = surface.get_bytesize() * surface.get_width() * surface.get_height()
+        old = self.tiles.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.tiles[key] = (surface, nbytes, owner)
+        self.size += nbytes
+
+        # Always keep the newest tile, even if it alone exceeds the budget
+        while self.size > self.max_bytes and len(self.tiles) > 1:
+            _, (_, evicted, _) = self.tiles.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self):
+        """Drop every cached tile"""
+        self.tiles.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self.tiles)
+
+
+class PageViewport:
+    """Zoomable, pannable window onto one PDF page, drawn from cached tiles"""
+
+    def __init__(self, doc, box_width, box_height, center, cache=None,
+                 tile_size=PDF_TILE_SIZE, zoom_levels=PDF_ZOOM_LEVELS):
+        self.doc = doc
+        self.box_width = box_width
+        self.box_height = box_height
+        self.center = center
+        self.cache = cache if cache is not None else TileCache()
+        self.tile_size = tile_size
+        self.zoom_levels = zoom_levels
+        self.tiles_per_frame = PDF_TILES_PER_FRAME
+        self.zoom_index = 0
+        self.page_number = 0
+        self.page = None
+        self.fit_scale = 1.0
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self.pending_tiles = 0
+
+    def set_document(self, doc):
+        """Switch to another PDF; its tiles would collide with the old keys"""
+        self.doc = doc
+        self.page = None
+        self.cache.clear()
+
+    def set_page(self, page_number):
+        """Show another page, keeping the zoom level and scrolling to its top"""
+        self.page_number = page_number
+        self.page = self.doc.load_page(page_number)
+        rect = self.page.rect
+        self.fit_scale = min(self.box_width / rect.width, self.box_height / rect.height)
+        view = self.rect
+        self.pan_x = (self.content_size[0] - view.width) / 2
+        self.pan_y = 0.0
+        self._clamp()
+
+    @property
+    def zoom(self):
+        return self.zoom_levels[self.zoom_index]
+
+    @property
+    def render_scale(self):
+        """PDF points to screen pixels at the current zoom"""
+        return self.fit_scale * self.zoom
+
+    @property
+    def content_size(self):
+        """Pixel size of the whole page at the current zoom"""
+        rect = self.page.rect
+        scale = self.render_scale
+        return math.ceil(rect.width * scale), math.ceil(rect.height * scale)
+
+    @property
+    def rect(self):
+        """Screen rectangle the viewport occupies"""
+        content_w, content_h = self.content_size
+        view = pygame.Rect(0, 0, min(content_w, self.box_width), min(content_h, self.box_height))
+        view.center = self.center
+        return view
+
+    def is_zoomed(self):
+        return self.zoom_index > 0
+
+    def set_zoom(self, zoom_index, anchor=None):
+        """Change zoom level, keeping the point under anchor fixed on screen"""
+        zoom_index = max(0, min(len(self.zoom_levels) - 1, zoom_index))
+        if zoom_index == self.zoom_index or self.page is None:
+            return
+
+        view = self.rect
+        if anchor is None or not view.collidepoint(anchor):
+            anchor = view.center
+        content_x = self.pan_x + anchor[0] - view.left
+        content_y = self.pan_y + anchor[1] - view.top
+
+        old_scale = self.render_scale
+        self.zoom_index = zoom_index
+        ratio = self.render_scale / old_scale
+
+        view = self.rect
+        self.pan_x = content_x * ratio - (anchor[0] - view.left)
+        self.pan_y = content_y * ratio - (anchor[1] - view.top)
+        self._clamp()
+
+    def zoom_in(self, anchor=None):
+        self.set_zoom(self.zoom_index + 1, anchor)
+
+    def zoom_out(self, anchor=None):
+        self.set_zoom(self.zoom_index - 1, anchor)
+
+    def reset_zoom(self):
+        self.set_zoom(0)
+
+    def pan(self, dx, dy):
+        """Scroll the page by a screen-space delta (drag direction)"""
+        self.pan_x -= dx
+        self.pan_y -= dy
+        self._clamp()
+
+    def _clamp(self):
+        content_w, content_h = self.content_size
+        view = self.rect
+        self.pan_x = max(0.0, min(self.pan_x, content_w - view.width))
+        self.pan_y = max(0.0, min(self.pan_y, content_h - view.height))
+
+    def visible_tiles(self):
+        """(col, row) of every tile intersecting the viewport"""
+        view = self.rect
+        size = self.tile_size
+        first_col = int(self.pan_x) // size
+        first_row = int(self.pan_y) // size
+        last_col = (int(self.pan_x) + view.width - 1) // size
+        last_row = (int(self.pan_y) + view.height - 1) // size
+        return [(col, row)
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)]
+
+    def render_tile(self, col, row):
+        """Rasterize a single tile through PyMuPDF's clip rectangle"""
+        scale = self.render_scale
+        size = self.tile_size
+        content_w, content_h = self.content_size
+        page_rect = self.page.rect
+
+        x0, y0 = col * size, row * size
+        x1, y1 = min(x0 + size, content_w), min(y0 + size, content_h)
+        clip = fitz.Rect(page_rect.x0 + x0 / scale, page_rect.y0 + y0 / scale,
+                         page_rect.x0 + x1 / scale, page_rect.y0 + y1 / scale)
+
+        pix = self.page.get_pixmap(matrix=fitz.Matrix(scale, scale), clip=clip, alpha=False)
+        return PixmapSurface(pix)
+
+    def draw(self, surface):
+        """Blit visible tiles, rendering at most tiles_per_frame missing ones"""
+        if self.page is None:
+            return
+
+        view = self.rect
+        size = self.tile_size
+        budget = self.tiles_per_frame
+        scale_key = round(self.render_scale, 4)
+        self.pending_tiles = 0
+
+        old_clip = surface.get_clip()
+        surface.set_clip(view)
+
+        for col, row in self.visible_tiles():
+            key = (self.page_number, scale_key, col, row)
+            tile = self.cache.get(key)
+            if tile is None and budget > 0:
+                rendered = self.render_tile(col, row)
+                tile = rendered.surface
+                self.cache.put(key, tile, rendered.pixmap)
+                budget -= 1
+
+            dest = (view.left + col * size - int(self.pan_x), view.top + row * size - int(self.pan_y))
+            if tile is not None:
+                surface.blit(tile, dest)
+            else:
+                # Filled in on a later frame once the render budget allows
+                pygame.draw.rect(surface, WHITE, (dest[0], dest[1], size, size))
+                self.pending_tiles += 1
+
+        surface.set_clip(old_clip)
@@ -8,6 +8,9 @@ import json
 from datetime import datetime
 import fitz  # PyMuPDF
 
+from config import MCQ_DIR
+from quiz.bank import ModuleBank
+
 # --- Initialization ---
 pygame.init()
 pygame.mixer.init()
@@ -341,78 +344,9 @@ class PDFReader:
 
 
 # --- Game Data ---
-questions = [
-    {
-        "question": "What is the primary focus of 'The Art of War'?",
-        "options": ["A. Building fortifications", "B. Strategy and conflict resolution", "C. Weapon development", "D. Naval warfare"],
-        "answer": "B",
-        "difficulty": "Easy",
-        "category": "Fundamentals"
-    },
-    {
-        "question": "According to Sun Tzu, what is the best way to win a battle?",
-        "options": ["A. Using superior numbers", "B. Winning without fighting", "C. Developing advanced weapons", "D. Long sieges"],
-        "answer": "B",
-        "difficulty": "Easy",
-        "category": "Strategy"
-    },
-    {
-        "question": "Which of the following is NOT one of the five things to assess before battle according to Sun Tzu?",
-        "options": ["A. The Way", "B. The weather", "C. The terrain", "D. The enemy's weaponry"],
-        "answer": "D",
-        "difficulty": "Medium",
-        "category": "Assessment"
-    },
-    {
-        "question": "What does Sun Tzu say about deception in warfare?",
-        "options": ["A. It should never be used", "B. It is essential to military operations", "C. It only works against weak enemies", "D. It is dishonorable"],
-        "answer": "B",
-        "difficulty": "Medium",
-        "category": "Tactics"
-    },
-    {
-        "question": "According to Sun Tzu, what should you do when facing a stronger enemy?",
-        "options": ["A. Attack immediately", "B. Avoid them if possible", "C. Surrender", "D. Request reinforcements"],
-        "answer": "B",
-        "difficulty": "Medium",
-        "category": "Strategy"
-    },
-    {
-        "question": "What does Sun Tzu compare military formation to in Chapter 6?",
-        "options": ["A. A mountain", "B. Water", "C. Fire", "D. Wind"],
-        "answer": "B",
-        "difficulty": "Hard",
-        "category": "Formations"
-    },
-    {
-        "question": "Which of these is considered one of the five dangerous traits in generals according to Sun Tzu?",
-        "options": ["A. Being too cautious", "B. Being ready to die", "C. Being too intelligent", "D. Being too wealthy"],
-        "answer": "B",
-        "difficulty": "Hard",
-        "category": "Leadership"
-    },
-    {
-        "question": "What does Sun Tzu say about surrounding an enemy army?",
-        "options": ["A. Always leave them an escape route", "B. Completely encircle them", "C. Never surround them", "D. Only surround weaker armies"],
-        "answer": "A",
-        "difficulty": "Hard",
-        "category": "Tactics"
-    },
-    {
-        "question": "According to Sun Tzu, what should you do when on 'deadly ground'?",
-        "options": ["A. Retreat immediately", "B. Fight", "C. Negotiate", "D. Surrender"],
-        "answer": "B",
-        "difficulty": "Hard",
-        "category": "Terrain"
-    },
-    {
-        "question": "What does Sun Tzu mean by 'the unorthodox and the orthodox give rise to each other'?",
-        "options": ["A. They should never be mixed", "B. They are interchangeable tactics", "C. Only orthodox methods work", "D. Unorthodox methods are superior"],
-        "answer": "B",
-        "difficulty": "Hard",
-        "category": "Strategy"
-    }
-]
+# Questions live in mcqs/art_of_war.jsonl, in the same format as the module banks
+QUESTION_BANK = os.path.join(MCQ_DIR, "art_of_war.jsonl")
+
 # --- Game Functions ---
 def create_background():
     background = pygame.Surface((WIDTH, HEIGHT))
@@ -441,9 +375,9 @@ def draw_crosshair(surface, mouse_pos):
 
 
 def show_question(surface, question_data, timer):
-    question_text = question_data['question']
-    category = question_data.get('category', 'General')
-    difficulty = question_data.get('difficulty', 'Medium')
+    question_text = question_data.prompt
+    category = question_data.category
+    difficulty = question_data.difficulty
 
     panel_height = 120
     panel = pygame.Surface((WIDTH - 40, panel_height), pygame.SRCALPHA)
@@ -510,6 +444,7 @@ def show_main_menu(surface):
 
 
 def run_quiz():
+    questions = ModuleBank.from_file(QUESTION_BANK, 0).questions
     particle_system = ParticleSystem()
     wind_system = WindSystem()
     score_system = ScoreSystem()
@@ -571,13 +506,13 @@ def run_quiz():
 
             if not bottles:
                 question = questions[q_index]
-                options = question['options']
+                options = question.options
                 bottles = []
                 spacing = WIDTH // 5
                 x = spacing
 
                 for opt in options:
-                    is_correct = opt.startswith(question['answer'])
+                    is_correct = opt.startswith(question.answer)
                     bottles.append(
                         Bottle(opt, x, HEIGHT // 2 - 60, correct=is_correct, difficulty=difficulty_multiplier))
                     x += spacing